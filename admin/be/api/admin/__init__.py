@@ -2,7 +2,7 @@
 Admin API Router
 """
 from fastapi import APIRouter
-from api.admin.endpoints import posts, sentiment, topic, summary, trend
+from api.admin.endpoints import posts, sentiment, topic, summary, trend, inference
 
 admin_api_router = APIRouter()
 
@@ -12,3 +12,4 @@ admin_api_router.include_router(sentiment.router, tags=["Admin - Sentiment"])
 admin_api_router.include_router(topic.router, tags=["Admin - Topic"])
 admin_api_router.include_router(summary.router, tags=["Admin - Summary"])
 admin_api_router.include_router(trend.router, tags=["Admin - Trend"])
+admin_api_router.include_router(inference.router, tags=["Admin - Inference"])
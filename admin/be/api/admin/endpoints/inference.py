@@ -0,0 +1,53 @@
+"""
+Admin endpoints for ML model management
+"""
+from fastapi import APIRouter, HTTPException
+from core.config import settings
+from core.executor import inference_executor
+from core.model_registry import model_registry
+from core.inference_cache import sentiment_cache
+from core.micro_batcher import sentiment_batcher
+from utils.inference_worker import inference_worker
+
+router = APIRouter()
+
+
+@router.get("/models")
+def list_models():
+    """List registered models with load state and load/warm-up times"""
+    return {
+        "backend": settings.INFERENCE_BACKEND,
+        "quantize_int8": settings.MODEL_QUANTIZE_INT8,
+        "models": [model_registry.info(name) for name in model_registry.names()],
+    }
+
+
+@router.post("/models/{name}/reload")
+def reload_model(name: str):
+    """Reload a model from disk (e.g. after replacing fine-tuned weights)"""
+    if name not in model_registry.names():
+        raise HTTPException(status_code=404, detail=f"Unknown model: {name}")
+    try:
+        model_registry.reload(name)
+    except Exception as e:
+        print(f"Error reloading model {name}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"message": f"Model '{name}' reloaded", **model_registry.info(name)}
+
+
+@router.get("/inference/status")
+def inference_status():
+    """Background inference queue depth, lag and counters, plus executor, micro-batcher and cache stats"""
+    return {
+        **inference_worker.status(),
+        "executor": inference_executor.status(),
+        "micro_batcher": sentiment_batcher.status(),
+        "sentiment_cache": sentiment_cache.stats(),
+    }
+
+
+@router.post("/inference/cache/clear")
+def clear_inference_cache():
+    """Drop all cached sentiment results"""
+    sentiment_cache.clear()
+    return {"message": "Sentiment cache cleared", **sentiment_cache.stats()}
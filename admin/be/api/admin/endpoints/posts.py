@@ -8,15 +8,15 @@ import random
 from sqlalchemy.orm import Session
 from models_admin import PostRequest
 from core.database import get_db
+from core.executor import inference_executor
 from models.database import Post
-from api.admin.helpers import convert_post_to_postrequest
-from api.admin.models import load_topic_model, analyze_topic
+from api.admin.helpers import convert_post_to_postrequest, group_posts_by_topic, query_posts_with_comment_counts
 
 router = APIRouter()
 
 
 @router.get("/posts")
-async def get_posts(
+def get_posts(
     page: Optional[int] = 1,
     limit: Optional[int] = 30,
     topic: Optional[str] = None,
@@ -33,40 +33,45 @@ async def get_posts(
         # ================================
         # 1️⃣ LOAD POST TỪ DATABASE
         # ================================
-        query = db.query(Post).filter(Post.Status == "approved")
+        filters = [Post.Status == "approved"]
 
         # Filter by date
         if start_date:
             start_dt = datetime.strptime(start_date, "%Y-%m-%d").replace(
                 hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc
             )
-            query = query.filter(Post.CreatedOn >= start_dt)
+            filters.append(Post.CreatedOn >= start_dt)
 
         if end_date:
             end_dt = datetime.strptime(end_date, "%Y-%m-%d").replace(
                 hour=23, minute=59, second=59, microsecond=999999, tzinfo=timezone.utc
             )
-            query = query.filter(Post.CreatedOn <= end_dt)
+            filters.append(Post.CreatedOn <= end_dt)
 
         if topic:
-            query = query.filter(Post.Category == topic)
-        # Get total count before topic filter
-        posts_db = query.order_by(Post.CreatedOn.desc()).all()
-        
-        # Convert Post (DB) to PostRequest for topic analysis
-        posts = []
-        for post_db in posts_db:
-            comment_count = len(post_db.comments) if post_db.comments else 0
-            post_request = convert_post_to_postrequest(post_db, comment_count)
-            posts.append(post_request)
+            filters.append(Post.Category == topic)
+        # Get total count before pagination
+        total = db.query(Post).filter(*filters).count()
 
         # ====================================
         # 4️⃣ PHÂN TRANG
         # ====================================
-        total = len(posts)
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_posts = posts[start_idx:end_idx]
+        # Only the requested page is loaded, with comment counts from one
+        # GROUP BY join: two queries however many posts/comments there are
+        start_idx = max((page - 1) * limit, 0)
+        rows = (
+            query_posts_with_comment_counts(db)
+            .filter(*filters)
+            .order_by(Post.CreatedOn.desc())
+            .offset(start_idx)
+            .limit(limit)
+            .all()
+        )
+
+        # Convert Post (DB) to PostRequest for topic analysis
+        paginated_posts = [
+            convert_post_to_postrequest(post_db, comment_count) for post_db, comment_count in rows
+        ]
 
         return {
             "message": "Get posts successfully",
@@ -90,11 +95,11 @@ def get_post_by_id(
     Get post by ID from Database
     """
     try:
-        post_db = db.query(Post).filter(Post.PostID == post_id).first()
-        if not post_db:
+        row = query_posts_with_comment_counts(db).filter(Post.PostID == post_id).first()
+        if not row:
             raise HTTPException(status_code=404, detail="Post not found")
         
-        comment_count = len(post_db.comments) if post_db.comments else 0
+        post_db, comment_count = row
         return convert_post_to_postrequest(post_db, comment_count)
         
     except HTTPException:
@@ -114,6 +119,11 @@ async def get_posts_by_category(
     Get posts by category from Database and return grouped by topic
     Categories: Cơ sở vật chất, Giảng viên, Sinh viên, Chương trình đào tạo
     """
+    # Query + topic inference for new posts run on the inference pool, off the event loop
+    return await inference_executor.run(_posts_by_category, category, start_date, end_date, db)
+
+
+def _posts_by_category(category: Optional[str], start_date: Optional[str], end_date: Optional[str], db: Session):
     try:
         from datetime import datetime, timezone
 
@@ -150,61 +160,12 @@ async def get_posts_by_category(
                 }
             }
 
-        # Initialize arrays for each topic
-        filtered_posts_facility = []
-        filtered_posts_lecture = []
-        filtered_posts_student = []
-        filtered_posts_program = []
-
-        # Load topic model
-        topic_model, topic_tokenizer, device = load_topic_model()
-        if not topic_model or not topic_tokenizer:
-            raise Exception("Failed to load topic model")
-
-        # Analyze topic for each post
-        for post_db in posts_db:
-            try:
-                # Analyze topic using post title and content
-                text_to_analyze = f"{post_db.Title} {post_db.Content}"
-                result = analyze_topic(text_to_analyze, topic_model, topic_tokenizer, device)
-                
-                # Create post dict with analyzed topic
-                post_data = {
-                    "postId": post_db.PostID,
-                    "title": post_db.Title,
-                    "content": post_db.Content,
-                    "category": post_db.Category,
-                    "createdOn": post_db.CreatedOn.isoformat() if post_db.CreatedOn else None,
-                    "upVotes": post_db.UpVotes,
-                    "downVotes": post_db.DownVotes,
-                    "topic": result.get("topic", "LABEL_2") if result else "LABEL_2",
-                    "confidence": result.get("confidence", 0.0) if result else 0.0
-                }
-                
-                # Categorize by topic
-                if result and result["topic"] == "LABEL_0":
-                    filtered_posts_facility.append(post_data)
-                elif result and result["topic"] == "LABEL_1":
-                    filtered_posts_lecture.append(post_data)
-                elif result and result["topic"] == "LABEL_2":
-                    filtered_posts_student.append(post_data)
-                elif result and result["topic"] == "LABEL_3":
-                    filtered_posts_program.append(post_data)
-                else:
-                    filtered_posts_student.append(post_data)  # Default to student
-                    
-            except Exception as e:
-                print(f"Error analyzing post {post_db.PostID}: {e}")
-                continue
+        # Stored topics; only new or edited posts are classified (batched)
+        data = group_posts_by_topic(db, posts_db)
 
         return {
             "message": "Get posts by category successfully",
-            "data": {
-                "facility": filtered_posts_facility,
-                "lecturer": filtered_posts_lecture,
-                "student": filtered_posts_student,
-                "program": filtered_posts_program
-            }
+            "data": data
         }
 
     except Exception as e:
@@ -3,19 +3,117 @@ Admin endpoints for summary generation
 """
 from fastapi import APIRouter, Depends
 from typing import List, Optional
+from datetime import datetime
+import time
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 from models_admin import PostRequest
-from api.admin.helpers import generate_school_summary_report, convert_post_to_postrequest
+from api.admin.helpers import SchoolSummaryBuilder, example_rank, generate_school_summary_report, parse_iso_datetime
+from api.admin.predictions import ensure_predictions
 from core.database import get_db
-from models.database import Post
+from core.model_registry import model_registry
+from core.summary_cache import summary_cache
+from models.database import Post, PostPrediction
 
 router = APIRouter()
 
+# Rows fetched per round trip while streaming posts, and posts classified per catch-up batch
+_STREAM_CHUNK = 1000
+_CATCH_UP_CHUNK = 256
+
+
+def _filter_posts(query, start: Optional[datetime], end: Optional[datetime], category: Optional[str]):
+    """Approved posts in the date range / category"""
+    query = query.filter(Post.Status == "approved")
+    if start:
+        query = query.filter(Post.CreatedOn >= start)
+    if end:
+        query = query.filter(Post.CreatedOn <= end)
+    if category:
+        query = query.filter(Post.Category == category)
+    return query
+
+
+def _summary_cache_key(db: Session, start: Optional[datetime], end: Optional[datetime],
+                       category: Optional[str]) -> tuple:
+    """
+    (range, category, model versions, watermark of the posts in range) - one aggregate query.
+    Total upvotes are part of the watermark since they rank the report's examples.
+    """
+    max_post_id, post_count, last_prediction, upvotes = _filter_posts(
+        db.query(func.max(Post.PostID), func.count(Post.PostID), func.max(PostPrediction.UpdatedOn),
+                 func.sum(Post.UpVotes))
+        .outerjoin(PostPrediction, PostPrediction.PostID == Post.PostID),
+        start, end, category,
+    ).one()
+    return (
+        start.isoformat() if start else None,
+        end.isoformat() if end else None,
+        category or None,
+        model_registry.version("sentiment"),
+        model_registry.version("summary"),
+        max_post_id,
+        post_count,
+        str(last_prediction) if last_prediction else None,
+        upvotes or 0,
+    )
+
+
+def _school_summary_from_db(db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                            category: Optional[str] = None) -> str:
+    """
+    One pass over the approved posts with a server-side cursor: only the
+    columns the report needs, no ORM objects, constant memory for 100k+ posts.
+    The report is cached until the posts in range change.
+    """
+    # Classify posts without a current stored sentiment first: new posts,
+    # edited posts (update_post clears the model version) and posts scored by
+    # an older model. Normally none, the background worker keeps up.
+    pending_ids = [
+        post_id for (post_id,) in _filter_posts(
+            db.query(Post.PostID).outerjoin(PostPrediction, PostPrediction.PostID == Post.PostID),
+            start, end, category,
+        ).filter(
+            or_(
+                PostPrediction.PostID.is_(None),
+                PostPrediction.SentimentModelVersion.is_(None),
+                PostPrediction.SentimentModelVersion != model_registry.version("sentiment"),
+            ),
+        )
+    ]
+    for offset in range(0, len(pending_ids), _CATCH_UP_CHUNK):
+        chunk = db.query(Post).filter(Post.PostID.in_(pending_ids[offset:offset + _CATCH_UP_CHUNK])).all()
+        ensure_predictions(db, chunk, sentiment=True, topic=False)
+        db.expunge_all()
+
+    # Watermark taken after the catch-up, so the newly stored predictions are part of it
+    cache_key = _summary_cache_key(db, start, end, category)
+    cached = summary_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    started = time.perf_counter()
+    builder = SchoolSummaryBuilder()
+    rows = _filter_posts(
+        db.query(Post.Title, Post.Content, Post.UpVotes,
+                 PostPrediction.SentimentLabel, PostPrediction.SentimentScore)
+        .outerjoin(PostPrediction, PostPrediction.PostID == Post.PostID),
+        start, end, category,
+    ).order_by(Post.PostID).yield_per(_STREAM_CHUNK)
+    for title, content, upvotes, sentiment, score in rows:
+        builder.add(sentiment, content, title, rank=example_rank(score, upvotes))
+    report = builder.build()
+    summary_cache.put(cache_key, report, build_seconds=time.perf_counter() - started)
+    return report
+
 
 @router.post("/school-summary-2")
 def summarize_shool(
     request: List[PostRequest],
     selected_page: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -23,6 +121,8 @@ def summarize_shool(
     - If selected_page=0 or None (from database): 
       * Analyze using Content
       * Display Title in results
+      * Optional start_date/end_date (ISO) and category narrow the posts
+      * Cached until a post in range changes (see /school-summary-2/cache)
     - If selected_page>=1 (from CSV): 
       * Analyze and display using text as is
     """
@@ -38,25 +138,8 @@ def summarize_shool(
                 is_from_db = True
         
         if is_from_db:
-            # Query all approved posts from database
-            posts_db = db.query(Post).filter(Post.Status == "approved").all()
-            
-            # Convert to PostRequest with Content (for analysis)
-            posts_for_summary = []
-            titles = []
-            for post_db in posts_db:
-                comment_count = len(post_db.comments) if post_db.comments else 0
-                # Use Content for analysis (use_title=False)
-                post_request = convert_post_to_postrequest(post_db, comment_count, use_title=False)
-                posts_for_summary.append(post_request)
-                # Store Title separately for display
-                titles.append(post_db.Title if post_db.Title else "")
-            
-            print(f"DEBUG: Generating summary with {len(posts_for_summary)} posts, {len(titles)} titles")
-            print(f"DEBUG: First title: {titles[0] if titles else 'None'}")
-            
-            # Generate summary: analyze with Content, display with Title
-            summary = generate_school_summary_report(posts_for_summary, titles=titles)
+            # Stream approved posts with their stored sentiment: Content analyzed, Title displayed
+            summary = _school_summary_from_db(db, parse_iso_datetime(start_date), parse_iso_datetime(end_date), category)
         else:
             # Use provided request (from CSV or already converted)
             # For CSV posts, use text as is (already contains full content)
@@ -77,3 +160,19 @@ def summarize_shool(
         import random
         return random.choice(fallback_comments)
 
+
+@router.get("/school-summary-2/cache")
+def school_summary_cache(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Age of the cached report for these filters (None = next call rebuilds it), plus all cache entries"""
+    cache_key = _summary_cache_key(db, parse_iso_datetime(start_date), parse_iso_datetime(end_date), category)
+    age = summary_cache.age(cache_key)
+    return {
+        "cached": age is not None,
+        "age_seconds": round(age, 1) if age is not None else None,
+        **summary_cache.status(),
+    }
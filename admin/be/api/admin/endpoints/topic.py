@@ -4,9 +4,9 @@ Admin endpoints for topic modeling
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from models_admin import SentimentRequestBody
-from api.admin.helpers import get_data, PAGES_CONST
-from api.admin.models import load_topic_model, analyze_topic
-from untils import load_sentiment_model
+from api.admin.helpers import get_data, PAGES_CONST, group_posts_by_topic
+from api.admin.predictions import ensure_predictions
+from utils.sentiment_rollup import sync_post_rollup
 from core.database import get_db
 from models.database import Post
 import random
@@ -32,60 +32,12 @@ def post_topics(db: Session = Depends(get_db)):
                 }
             }
         
-        filtered_posts_facility = []
-        filtered_posts_lecture = []
-        filtered_posts_student = []
-        filtered_posts_program = []
-        
-        # Load topic model
-        topic_model, topic_tokenizer, device = load_topic_model()
-        if not topic_model or not topic_tokenizer:
-            raise Exception("Failed to load topic model")
-        
-        # Analyze topic for each post
-        for post_db in posts_db:
-            try:
-                # Analyze topic using post title and content
-                text_to_analyze = f"{post_db.Title} {post_db.Content}"
-                result = analyze_topic(text_to_analyze, topic_model, topic_tokenizer, device)
-                
-                # Create post dict with analyzed topic
-                post_data = {
-                    "postId": post_db.PostID,
-                    "title": post_db.Title,
-                    "content": post_db.Content,
-                    "category": post_db.Category,
-                    "createdOn": post_db.CreatedOn.isoformat() if post_db.CreatedOn else None,
-                    "upVotes": post_db.UpVotes,
-                    "downVotes": post_db.DownVotes,
-                    "topic": result.get("topic", "LABEL_2") if result else "LABEL_2",
-                    "confidence": result.get("confidence", 0.0) if result else 0.0
-                }
-                
-                # Categorize by topic
-                if result and result["topic"] == "LABEL_0":
-                    filtered_posts_facility.append(post_data)
-                elif result and result["topic"] == "LABEL_1":
-                    filtered_posts_lecture.append(post_data)
-                elif result and result["topic"] == "LABEL_2":
-                    filtered_posts_student.append(post_data)
-                elif result and result["topic"] == "LABEL_3":
-                    filtered_posts_program.append(post_data)
-                else:
-                    filtered_posts_student.append(post_data)  # Default to student
-                    
-            except Exception as e:
-                print(f"Error analyzing post {post_db.PostID}: {e}")
-                continue
-        
+        # Stored topics; only new or edited posts are classified (batched)
+        data = group_posts_by_topic(db, posts_db)
+
         return {
             "message": "Sentiment topic data retrieved successfully",
-            "data": {
-                "facility": filtered_posts_facility,
-                "lecturer": filtered_posts_lecture,
-                "student": filtered_posts_student,
-                "program": filtered_posts_program
-            }
+            "data": data
         }
     except Exception as e:
         print(f"Error in sentiment topic: {e}")
@@ -107,16 +59,10 @@ def analyze_and_update_post_topic(
         if not post:
             raise HTTPException(status_code=404, detail="Post not found")
         
-        # Load topic model
-        topic_model, topic_tokenizer, device = load_topic_model()
-        if not topic_model or not topic_tokenizer:
-            raise HTTPException(status_code=500, detail="Failed to load topic model")
-        
-        # Analyze topic using post content
-        text_to_analyze = f"{post.Title} {post.Content}"
-        result = analyze_topic(text_to_analyze, topic_model, topic_tokenizer, device)
+        # Stored topic prediction; classified only if missing or stale
+        prediction = ensure_predictions(db, [post], sentiment=False, topic=True)[post.PostID]
         
-        if not result:
+        if not prediction.TopicLabel:
             raise HTTPException(status_code=500, detail="Failed to analyze topic")
         
         # Map topic label to category
@@ -127,11 +73,12 @@ def analyze_and_update_post_topic(
             "LABEL_3": "Chương trình đào tạo"
         }
         
-        topic_label = result.get("topic", "LABEL_2")
+        topic_label = prediction.TopicLabel
         category = topic_mapping.get(topic_label, "Sinh viên")
         
         # Update post category
         post.Category = topic_label
+        sync_post_rollup(db, post, prediction)
         db.commit()
         db.refresh(post)
         
@@ -140,7 +87,7 @@ def analyze_and_update_post_topic(
             "postId": post_id,
             "topic": topic_label,
             "category": category,
-            "confidence": result.get("confidence", 0.0)
+            "confidence": prediction.TopicConfidence or 0.0
         }
         
     except HTTPException:
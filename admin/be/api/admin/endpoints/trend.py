@@ -4,13 +4,14 @@ Admin endpoints for sentiment trend analysis
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Optional
 from datetime import datetime, timedelta, timezone
-from dateutil.parser import isoparse
-import logging
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
-from untils import load_sentiment_model, preprocess_text, load_stopwords
-from api.admin.models import load_topic_model, analyze_topic
+from api.admin.helpers import parse_iso_datetime
+from api.admin.predictions import ensure_predictions
 from core.database import get_db
-from models.database import Post
+from core.executor import inference_executor
+from core.model_registry import model_registry
+from models.database import Post, PostPrediction, SentimentDailyRollup
 
 router = APIRouter()
 
@@ -24,84 +25,64 @@ async def get_sentiment_trend(
 ):
     
     """Get sentiment trend over time from database posts"""
-    try:
-        model_path = "fine_tuned_model"
-        sentiment_classifier, tokenizer = load_sentiment_model(model_path)
-        if not sentiment_classifier or not tokenizer:
-            raise Exception("Failed to load sentiment model")
-
-        stopwords_path = "data/vietnamese-stopwords.txt"
-        stopwords = load_stopwords(stopwords_path)
-
-        # Parse date range
-        if start_date:
-            try:
-                start_datetime = isoparse(start_date)
-                if start_datetime.tzinfo is None:
-                    start_datetime = start_datetime.replace(tzinfo=timezone.utc)
-            except Exception as e:
-                logging.error(f"Invalid start date format: {e} for input: {start_date}")
-                start_datetime = datetime.now(timezone.utc) - timedelta(days=365 * 5)
-        else:
-            start_datetime = datetime.now(timezone.utc) - timedelta(days=365 * 5)
+    # DB queries and catch-up inference block, so they run on the inference pool
+    return await inference_executor.run(_sentiment_trend, start_date, end_date, topic, db)
 
-        if end_date:
-            try:
-                end_datetime = isoparse(end_date)
-                if end_datetime.tzinfo is None:
-                    end_datetime = end_datetime.replace(tzinfo=timezone.utc)
-            except Exception as e:
-                logging.error(f"Invalid end date format: {e} for input: {end_date}")
-                end_datetime = datetime.now(timezone.utc)
-        else:
-            end_datetime = datetime.now(timezone.utc)
 
-        # Load posts from DB within date range
-        query = db.query(Post).filter(
-        Post.Status == "approved",
-        Post.CreatedOn >= start_datetime,
-        Post.CreatedOn <= end_datetime,
+def _sentiment_trend(start_date: Optional[str], end_date: Optional[str], topic: Optional[str], db: Session):
+    try:
+        # Parse date range (invalid dates fall back to the last 5 years)
+        now = datetime.now(timezone.utc)
+        start_datetime = parse_iso_datetime(start_date, default=now - timedelta(days=365 * 5))
+        end_datetime = parse_iso_datetime(end_date, default=now)
+
+        # Catch up posts not yet counted in the rollup (new, unclassified or
+        # classified by an older model); normally this returns nothing
+        pending_query = (
+            db.query(Post)
+            .outerjoin(PostPrediction, PostPrediction.PostID == Post.PostID)
+            .filter(
+                Post.Status == "approved",
+                Post.CreatedOn >= start_datetime,
+                Post.CreatedOn <= end_datetime,
+                or_(
+                    PostPrediction.PostID.is_(None),
+                    PostPrediction.RollupDay.is_(None),
+                    PostPrediction.SentimentModelVersion != model_registry.version("sentiment"),
+                ),
+            )
         )
-
         if topic:
-            query = query.filter(Post.Category == topic)
-
-        posts_db = query.order_by(Post.CreatedOn).all()
+            pending_query = pending_query.filter(Post.Category == topic)
+
+        pending_posts = pending_query.all()
+        if pending_posts:
+            ensure_predictions(db, pending_posts, sentiment=True, topic=False)
+
+        # Sum the daily rollup: O(days) instead of O(posts)
+        rollup_query = db.query(
+            SentimentDailyRollup.Day,
+            func.sum(SentimentDailyRollup.Positive),
+            func.sum(SentimentDailyRollup.Negative),
+            func.sum(SentimentDailyRollup.Neutral),
+        ).filter(
+            SentimentDailyRollup.Day >= start_datetime.date(),
+            SentimentDailyRollup.Day <= end_datetime.date(),
+        )
+        if topic:
+            rollup_query = rollup_query.filter(SentimentDailyRollup.Category == topic)
 
-        if not posts_db:
-            return {"message": "Sentiment trend data retrieved successfully", "data": []}
+        rollup_rows = rollup_query.group_by(SentimentDailyRollup.Day).all()
 
-    
-        # Group posts by month
+        # Group days by month
         monthly_data = {}
-        for post in posts_db:
-            try:
-                print(f"Processing post ID: {post.PostID}, CreatedOn: {post.CreatedOn}, Title: {post.Title}")
-                if not post.CreatedOn:
-                    continue
-                month_key = post.CreatedOn.strftime("%m/%Y")
-
-                if month_key not in monthly_data:
-                    monthly_data[month_key] = {"Positive": 0, "Negative": 0, "Neutral": 0}
-
-                text_to_classify = f"{post.Title} {post.Content}" if post.Title else post.Content
-                processed_text = preprocess_text(
-                    text_to_classify,
-                    remove_emoji=True,
-                    lowercase=True,
-                    remove_stopwords=True,
-                    stopwords=stopwords,
-                    remove_special=True,
-                )
-
-                result = sentiment_classifier(processed_text, truncation=True, max_length=100)
-                label = result[0]["label"]
-                sentiment = {"LABEL_0": "Negative", "LABEL_1": "Neutral", "LABEL_2": "Positive"}[label]
-
-                monthly_data[month_key][sentiment] += 1
-            except Exception as e:
-                print(f"Error processing post: {e}")
-                continue
+        for day, positive, negative, neutral in rollup_rows:
+            month_key = day.strftime("%m/%Y")
+            if month_key not in monthly_data:
+                monthly_data[month_key] = {"Positive": 0, "Negative": 0, "Neutral": 0}
+            monthly_data[month_key]["Positive"] += positive or 0
+            monthly_data[month_key]["Negative"] += negative or 0
+            monthly_data[month_key]["Neutral"] += neutral or 0
 
         # Convert to required format
         trend_data = []
@@ -110,6 +91,8 @@ async def get_sentiment_trend(
                 month_date = datetime.strptime(month, "%m/%Y")
                 display_month = month_date.strftime("%m/%Y")
 
+                if not any(counts.values()):
+                    continue
                 trend_data.append(
                     {
                         "day": display_month,
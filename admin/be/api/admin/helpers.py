@@ -2,12 +2,20 @@
 Helper functions for admin API
 """
 import csv
+import heapq
+import logging
+import math
 import random
 from datetime import datetime, timedelta, timezone
 from dateutil.parser import isoparse
-from typing import List, Optional
+from typing import List, Optional, Tuple
+import numpy as np
+from sqlalchemy import func
 from models_admin import PostRequest
+from models.database import Comment, Post
+from core.model_registry import model_registry
 from untils import *
+from core.config import settings
 from underthesea import sent_tokenize
 from collections import Counter
 
@@ -16,35 +24,45 @@ PAGES_CONST = ["Utc2Confessions.csv", "Utc2Zone.csv", "Utc2NoiChiaSeCamXuc.csv",
 POS = "Tích cực"
 NEG = "Tiêu cực"
 NEU = "Trung lập"
+TOPIC_GROUPS = {"LABEL_0": "facility", "LABEL_1": "lecturer", "LABEL_2": "student", "LABEL_3": "program"}
+# Weight of log(1 + upvotes) against sentiment confidence when ranking report examples
+UPVOTE_RANK_WEIGHT = 0.25
 
-# Global models (loaded in server.py)
-SENTIMENT_CLASSIFIER_SUMMARY = None
-SENTIMENT_TOKENIZER_SUMMARY = None
-summary_model_global = None
-summary_tokenizer_global = None
+# Stopwords and device (set in server.py); models are resolved through the registry
 stopwords_global = None
 device = None
 
 
-def set_global_models(sentiment_classifier, sentiment_tokenizer, summary_model, summary_tokenizer, stopwords, device_obj):
-    """Set global models"""
-    global SENTIMENT_CLASSIFIER_SUMMARY, SENTIMENT_TOKENIZER_SUMMARY
-    global summary_model_global, summary_tokenizer_global, stopwords_global, device
-    SENTIMENT_CLASSIFIER_SUMMARY = sentiment_classifier
-    SENTIMENT_TOKENIZER_SUMMARY = sentiment_tokenizer
-    summary_model_global = summary_model
-    summary_tokenizer_global = summary_tokenizer
+def set_global_models(sentiment_classifier=None, sentiment_tokenizer=None, summary_model=None,
+                      summary_tokenizer=None, stopwords=None, device_obj=None):
+    """Register models loaded at startup in the shared model registry"""
+    global stopwords_global, device
+    if sentiment_classifier is not None:
+        model_registry.set("sentiment", (sentiment_classifier, sentiment_tokenizer))
+    if summary_model is not None:
+        model_registry.set("summary", (summary_model, summary_tokenizer))
     stopwords_global = stopwords
     device = device_obj
 
 
+def get_sentiment_classifier():
+    """Shared sentiment pipeline from the model registry"""
+    sentiment_classifier, _ = model_registry.get("sentiment")
+    return sentiment_classifier
+
+
+def get_summary_model():
+    """Shared (model, tokenizer) pair for sentence-importance scoring"""
+    return model_registry.get("summary")
+
+
 def convert_post_to_postrequest(post_db, comment_count: int = 0, use_title: bool = False):
     """
     Convert Post (database) to PostRequest (CSV format)
     
     Args:
         post_db: Post model from database
-        comment_count: Number of comments (from relationship)
+        comment_count: Number of comments (see query_posts_with_comment_counts)
         use_title: If True, use Title instead of Content (for summary)
     
     Returns:
@@ -73,6 +91,50 @@ def convert_post_to_postrequest(post_db, comment_count: int = 0, use_title: bool
     )
 
 
+def query_posts_with_comment_counts(db):
+    """
+    db.query((Post, comment_count)): counts come from one GROUP BY subquery
+    joined to the posts, instead of loading post.comments for every post
+    """
+    counts = (
+        db.query(Comment.PostID.label("PostID"), func.count(Comment.CommentID).label("comment_count"))
+        .group_by(Comment.PostID)
+        .subquery()
+    )
+    return (
+        db.query(Post, func.coalesce(counts.c.comment_count, 0))
+        .outerjoin(counts, counts.c.PostID == Post.PostID)
+    )
+
+
+def group_posts_by_topic(db, posts_db) -> dict:
+    """
+    Group DB posts as facility/lecturer/student/program using stored topic
+    predictions; only missing or stale posts are classified (in batches)
+    """
+    from api.admin.predictions import ensure_predictions
+    predictions = ensure_predictions(db, posts_db, sentiment=False, topic=True)
+
+    groups = {"facility": [], "lecturer": [], "student": [], "program": []}
+    for post_db in posts_db:
+        prediction = predictions[post_db.PostID]
+        topic = prediction.TopicLabel or "LABEL_2"
+        post_data = {
+            "postId": post_db.PostID,
+            "title": post_db.Title,
+            "content": post_db.Content,
+            "category": post_db.Category,
+            "createdOn": post_db.CreatedOn.isoformat() if post_db.CreatedOn else None,
+            "upVotes": post_db.UpVotes,
+            "downVotes": post_db.DownVotes,
+            "topic": topic,
+            "confidence": prediction.TopicConfidence or 0.0
+        }
+        # Unknown labels default to student
+        groups[TOPIC_GROUPS.get(topic, "student")].append(post_data)
+    return groups
+
+
 def get_data(path):
     """Load data from CSV file"""
     posts = []
@@ -100,159 +162,280 @@ def format_to_iso_string(dt_obj: datetime) -> str:
     return iso_str.replace('+00:00', 'Z')
 
 
+def parse_iso_datetime(value: Optional[str], default: Optional[datetime] = None) -> Optional[datetime]:
+    """Chuỗi ngày ISO -> datetime có múi giờ (UTC nếu thiếu); trả về default khi rỗng hoặc sai định dạng"""
+    if not value:
+        return default
+    try:
+        parsed = isoparse(value)
+    except Exception as e:
+        logging.error(f"Invalid date format: {e} for input: {value}")
+        return default
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
 def analyze_sentiment_for_summary(text: str) -> str:
     """Phân tích cảm xúc văn bản cho tóm tắt"""
+    return analyze_sentiments_for_summary([text])[0]
+
+
+def analyze_sentiments_for_summary(texts: List[str]) -> List[str]:
+    """Phân tích cảm xúc nhiều văn bản trong một lần batch (Positive/Negative/Neutral)"""
+    return [label for label, _ in score_sentiments_for_summary(texts)]
+
+
+def score_sentiments_for_summary(texts: List[str]) -> List[Tuple[str, Optional[float]]]:
+    """Như analyze_sentiments_for_summary, kèm độ tin cậy của nhãn: [(label, score), ...]"""
     try:
-        processed_text = preprocess_text(
-            text, remove_emoji=True, lowercase=True,
-            remove_stopwords=True, stopwords=stopwords_global, remove_special=True
-        )
-        result = SENTIMENT_CLASSIFIER_SUMMARY(processed_text, truncation=True, max_length=100)
-        label = result[0]["label"]
-        sentiment = {"LABEL_0": "Negative", "LABEL_1": "Neutral", "LABEL_2": "Positive"}[label]
-        return sentiment
+        normalizer = TextNormalizer(remove_emoji=True, lowercase=True, remove_special=True,
+                                    stopwords=stopwords_global or get_stopword_matcher())
+        results = predict_sentiment_batch(normalizer.normalize_many(texts), get_sentiment_classifier(),
+                                          cache_options="post")
+        return [(SENTIMENT_LABELS[result["label"]], result["score"]) for result in results]
     except Exception as e:
         print(f"Error analyzing sentiment: {e}")
-        return "Neutral"
+        return [("Neutral", None)] * len(texts)
+
+
+def score_sentences_batch(sentences: List[str]) -> np.ndarray:
+    """
+    Độ quan trọng của nhiều câu (có thể từ nhiều bài) - shape (N,)
+    Sentences are length-bucketed and padded per batch, one forward pass per batch.
+    """
+    scores = np.full(len(sentences), 0.5, dtype=np.float32)
+    if not sentences:
+        return scores
+    try:
+        summary_model_global, summary_tokenizer_global = get_summary_model()
+        if summary_model_global is None or summary_tokenizer_global is None:
+            return scores
+        probabilities = run_classifier_batches(sentences, summary_model_global, summary_tokenizer_global,
+                                               batch_size=settings.SUMMARY_BATCH_SIZE,
+                                               max_length=settings.SUMMARY_MAX_LENGTH)
+        return probabilities[:, 1]
+    except Exception as e:
+        print(f"Error scoring sentences: {e}")
+        return scores
 
 
 def score_sentence_importance(sentence: str) -> float:
     """Đánh giá độ quan trọng của câu"""
+    return float(score_sentences_batch([sentence])[0])
+
+
+def _summary_sentences(text: str) -> List[str]:
+    sentences = sent_tokenize(text)
+    return [s.strip() for s in sentences if len(s.strip()) > 10]
+
+
+def _select_summary(text: str, sentences: List[str], scores, top_k: int, min_score: float) -> str:
+    if not sentences:
+        return text[:100] + "..." if len(text) > 100 else text
+
+    ranked = list(zip(sentences, (float(score) for score in scores)))
+    high_score = [(s, sc) for s, sc in ranked if sc >= min_score]
+
+    if len(high_score) < top_k:
+        ranked = sorted(ranked, key=lambda x: x[1], reverse=True)
+        selected = [s for s, _ in ranked[:top_k]]
+    else:
+        high_score = sorted(high_score, key=lambda x: x[1], reverse=True)
+        selected = [s for s, _ in high_score[:top_k]]
+
+    return " ".join(selected)
+
+
+def extractive_summaries_batch(texts: List[str], top_k: int = 2, min_score: float = 0.5) -> List[str]:
+    """Tóm tắt extractive nhiều bài: câu của tất cả các bài được chấm điểm trong một batch"""
     try:
-        import torch
-        if summary_model_global is None or summary_tokenizer_global is None:
-            return 0.5
-        
-        inputs = summary_tokenizer_global(sentence, return_tensors="pt", truncation=True, padding=True, max_length=256)
-        inputs = {k: v.to(device) for k, v in inputs.items()}
-        
-        with torch.no_grad():
-            logits = summary_model_global(**inputs).logits
-        
-        probs = torch.softmax(logits, dim=-1)[0]
-        return float(probs[1])
+        per_text = [_summary_sentences(text) for text in texts]
+        scores = score_sentences_batch([s for sentences in per_text for s in sentences])
+        summaries = []
+        offset = 0
+        for text, sentences in zip(texts, per_text):
+            summaries.append(_select_summary(text, sentences, scores[offset:offset + len(sentences)], top_k, min_score))
+            offset += len(sentences)
+        return summaries
     except Exception as e:
-        print(f"Error scoring sentence: {e}")
-        return 0.5
+        print(f"Error in extractive summary: {e}")
+        return [text[:100] + "..." for text in texts]
 
 
 def extractive_summary_simple(text: str, top_k: int = 2, min_score: float = 0.5) -> str:
     """Tóm tắt extractive đơn giản"""
-    try:
-        sentences = sent_tokenize(text)
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 10]
-        
-        if not sentences:
-            return text[:100] + "..." if len(text) > 100 else text
-        
-        ranked = []
-        for s in sentences:
-            score = score_sentence_importance(s)
-            ranked.append((s, score))
-        
-        high_score = [(s, sc) for s, sc in ranked if sc >= min_score]
-        
-        if len(high_score) < top_k:
-            ranked = sorted(ranked, key=lambda x: x[1], reverse=True)
-            selected = [s for s, _ in ranked[:top_k]]
+    return extractive_summaries_batch([text], top_k=top_k, min_score=min_score)[0]
+
+
+def example_rank(confidence: Optional[float], upvotes: Optional[int]) -> float:
+    """
+    How good a post is as a report example: sentiment confidence (0..1) plus
+    engagement on a log scale (UPVOTE_RANK_WEIGHT per e-fold of upvotes)
+    """
+    return (confidence or 0.0) + UPVOTE_RANK_WEIGHT * math.log1p(max(upvotes or 0, 0))
+
+
+def _select_examples(candidates, limit: int = 2, min_length: int = 20, max_rounds: int = 3):
+    """
+    candidates: {sentiment: [(content, display_text), ...]} best-ranked first.
+    Keep the first `limit` posts per sentiment whose top sentence is longer than
+    min_length. Posts too short to pass are skipped without running the model;
+    only the posts about to be chosen are summarized (all sentiments in one batch),
+    and a rejected one is replaced from the next-ranked posts for at most max_rounds.
+    """
+    examples = {sentiment: [] for sentiment in candidates}
+    position = {sentiment: 0 for sentiment in candidates}
+    for _ in range(max_rounds):
+        chunk = []
+        for sentiment, items in candidates.items():
+            needed = limit - len(examples[sentiment])
+            while needed > 0 and position[sentiment] < len(items):
+                content, display = items[position[sentiment]]
+                position[sentiment] += 1
+                # The summary is a subset of the post's sentences, never longer than it
+                if len(content) > min_length:
+                    chunk.append((sentiment, content, display))
+                    needed -= 1
+        if not chunk:
+            break
+
+        summaries = extractive_summaries_batch([content for _, content, _ in chunk], top_k=1, min_score=0.6)
+        for (sentiment, _, display), summary in zip(chunk, summaries):
+            if len(summary) > min_length:
+                examples[sentiment].append(display)
+    return examples
+
+
+class SchoolSummaryBuilder:
+    """
+    Single-pass school summary report: add() posts one at a time, then build().
+    Only the sentiment counters and a bounded heap of example candidates per
+    sentiment are kept, so memory stays flat however many posts are fed in.
+    """
+
+    def __init__(self, example_limit: int = 2, candidate_pool: int = 12):
+        self.example_limit = example_limit
+        self.candidate_pool = candidate_pool
+        self.sentiment_counts = Counter()
+        self.total = 0
+        self._candidates = {"Positive": [], "Negative": []}
+
+    def add(self, sentiment: Optional[str], content: str, display: Optional[str] = None, rank: float = 0.0):
+        """
+        sentiment: Positive/Negative/Neutral; content is what gets summarized,
+        display what the report shows (Title, falling back to content).
+        rank: example_rank() of the post; the best-ranked posts are kept as
+        example candidates, ties keep the earlier post.
+        """
+        self.total += 1
+        self.sentiment_counts[sentiment] += 1
+        heap = self._candidates.get(sentiment)
+        if heap is None:
+            return
+        display = display.strip() if display and display.strip() else content
+        # Min-heap on (rank, -order): the weakest, latest candidate is evicted first
+        item = (rank, -self.total, content, display)
+        if len(heap) < self.candidate_pool:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def candidates(self):
+        """{sentiment: [(content, display_text), ...]} best-ranked first"""
+        return {
+            sentiment: [(content, display) for _, _, content, display in sorted(heap, reverse=True)]
+            for sentiment, heap in self._candidates.items()
+        }
+
+    def build(self) -> str:
+        if not self.total:
+            return "Chưa có phản hồi nào để phân tích."
+        # Analyze using Content, but display Title; summaries are scored in batches
+        examples = _select_examples(self.candidates(), limit=self.example_limit)
+        return _format_school_report(self.sentiment_counts, self.total,
+                                     examples["Positive"], examples["Negative"])
+
+
+def _format_school_report(sentiment_counts: Counter, total: int, positive_examples: List[str],
+                          negative_examples: List[str]) -> str:
+    """Báo cáo dạng văn bản từ số lượng cảm xúc và các ví dụ tiêu biểu"""
+    positive_count = sentiment_counts.get("Positive", 0)
+    neutral_count = sentiment_counts.get("Neutral", 0)
+    negative_count = sentiment_counts.get("Negative", 0)
+
+    positive_ratio = (positive_count / total) * 100 if total > 0 else 0
+    negative_ratio = (negative_count / total) * 100 if total > 0 else 0
+    neutral_ratio = (neutral_count / total) * 100 if total > 0 else 0
+
+    # Tạo báo cáo
+    if positive_ratio >= 60:
+        opening = f"Phần lớn sinh viên (khoảng {positive_ratio:.0f}% phản hồi) thể hiện sự hài lòng cao đối với đội ngũ giảng viên và trải nghiệm học tập."
+    elif negative_ratio >= 50:
+        opening = f"Khoảng {negative_ratio:.0f}% phản hồi mang tính tiêu cực, phản ánh sự không hài lòng về các khía cạnh của nhà trường."
+    elif neutral_ratio >= 50:
+        opening = f"Phần lớn sinh viên có quan điểm trung lập (khoảng {neutral_ratio:.0f}%), không thể hiện rõ ràng sự hài lòng hay không hài lòng."
+    else:
+        opening = f"Ý kiến sinh viên khá đa dạng với {positive_ratio:.0f}% tích cực, {negative_ratio:.0f}% tiêu cực, và {neutral_ratio:.0f}% trung lập."
+    
+    details = []
+    if positive_count > 0:
+        if positive_examples:
+            pos_text = " ".join(positive_examples[:2])
+            details.append(f"Các nhận xét tích cực tập trung vào: {pos_text}")
         else:
-            high_score = sorted(high_score, key=lambda x: x[1], reverse=True)
-            selected = [s for s, _ in high_score[:top_k]]
-        
-        return " ".join(selected)
-    except Exception as e:
-        print(f"Error in extractive summary: {e}")
-        return text[:100] + "..."
+            details.append(f"Có {positive_count} đánh giá tích cực về giảng viên và môi trường học tập.")
+    
+    if negative_count > 0:
+        if negative_examples:
+            neg_text = " ".join(negative_examples[:2])
+            details.append(f"Một số góp ý cần cải thiện: {neg_text}")
+        else:
+            details.append(f"Có {negative_count} đánh giá tiêu cực liên quan đến cơ sở vật chất và quy trình học tập.")
+    
+    if positive_ratio >= 60:
+        closing = f"Nhìn chung, sinh viên đánh giá cao trải nghiệm học tập tại trường với {positive_count} đánh giá tích cực."
+    elif negative_ratio >= 50:
+        closing = f"Nhà trường cần chú ý cải thiện các vấn đề được phản ánh trong {negative_count} đánh giá tiêu cực."
+    else:
+        closing = f"Dữ liệu cho thấy có {positive_count} đánh giá tích cực, {negative_count} tiêu cực, và {neutral_count} trung lập."
+    
+    report_parts = [opening]
+    if details:
+        report_parts.extend(details)
+    report_parts.append(closing)
+    
+    return " ".join(report_parts)
 
 
-def generate_school_summary_report(posts: List[PostRequest], titles: Optional[List[str]] = None) -> str:
+def generate_school_summary_report(posts: List[PostRequest], titles: Optional[List[str]] = None,
+                                   sentiments: Optional[List[Optional[str]]] = None,
+                                   scores: Optional[List[Optional[float]]] = None) -> str:
     """
     Tạo báo cáo tổng hợp từ danh sách phản hồi
     Args:
         posts: List of PostRequest (text field contains Content for analysis)
         titles: Optional list of titles to display (if provided, use titles instead of text for display)
+        sentiments: Optional precomputed sentiment per post (Positive/Negative/Neutral), e.g. from post_predictions
+        scores: Optional confidence of each precomputed sentiment, used to rank examples
     """
     try:
-        if not posts:
-            return "Chưa có phản hồi nào để phân tích."
-        
-        sentiment_counts = Counter()
-        positive_examples = []
-        negative_examples = []
-        
-        for idx, post in enumerate(posts):
-            # Analyze sentiment using Content (post.text)
-            sentiment = analyze_sentiment_for_summary(post.text)
-            sentiment_counts[sentiment] += 1
-            
-            # Get display text: use Title if available, otherwise use Content
-            if titles and idx < len(titles) and titles[idx] and titles[idx].strip():
-                display_text = titles[idx].strip()  # Use Title for display
-                print(f"DEBUG: Using Title for post {idx}: {display_text[:50]}...")
-            else:
-                display_text = post.text  # Fallback to Content
-                print(f"DEBUG: Using Content for post {idx} (no title available)")
-            
-            if sentiment == "Positive" and len(positive_examples) < 3:
-                # Analyze using Content, but display Title
-                summary = extractive_summary_simple(post.text, top_k=1, min_score=0.6)
-                if len(summary) > 20:
-                    # Use Title for display if available
-                    positive_examples.append(display_text)
-            elif sentiment == "Negative" and len(negative_examples) < 3:
-                # Analyze using Content, but display Title
-                summary = extractive_summary_simple(post.text, top_k=1, min_score=0.6)
-                if len(summary) > 20:
-                    # Use Title for display if available
-                    negative_examples.append(display_text)
-        
-        total = len(posts)
-        positive_count = sentiment_counts.get("Positive", 0)
-        neutral_count = sentiment_counts.get("Neutral", 0)
-        negative_count = sentiment_counts.get("Negative", 0)
-        
-        positive_ratio = (positive_count / total) * 100 if total > 0 else 0
-        negative_ratio = (negative_count / total) * 100 if total > 0 else 0
-        neutral_ratio = (neutral_count / total) * 100 if total > 0 else 0
-        
-        # Tạo báo cáo
-        if positive_ratio >= 60:
-            opening = f"Phần lớn sinh viên (khoảng {positive_ratio:.0f}% phản hồi) thể hiện sự hài lòng cao đối với đội ngũ giảng viên và trải nghiệm học tập."
-        elif negative_ratio >= 50:
-            opening = f"Khoảng {negative_ratio:.0f}% phản hồi mang tính tiêu cực, phản ánh sự không hài lòng về các khía cạnh của nhà trường."
-        elif neutral_ratio >= 50:
-            opening = f"Phần lớn sinh viên có quan điểm trung lập (khoảng {neutral_ratio:.0f}%), không thể hiện rõ ràng sự hài lòng hay không hài lòng."
-        else:
-            opening = f"Ý kiến sinh viên khá đa dạng với {positive_ratio:.0f}% tích cực, {negative_ratio:.0f}% tiêu cực, và {neutral_ratio:.0f}% trung lập."
-        
-        details = []
-        if positive_count > 0:
-            if positive_examples:
-                pos_text = " ".join(positive_examples[:2])
-                details.append(f"Các nhận xét tích cực tập trung vào: {pos_text}")
-            else:
-                details.append(f"Có {positive_count} đánh giá tích cực về giảng viên và môi trường học tập.")
-        
-        if negative_count > 0:
-            if negative_examples:
-                neg_text = " ".join(negative_examples[:2])
-                details.append(f"Một số góp ý cần cải thiện: {neg_text}")
-            else:
-                details.append(f"Có {negative_count} đánh giá tiêu cực liên quan đến cơ sở vật chất và quy trình học tập.")
-        
-        if positive_ratio >= 60:
-            closing = f"Nhìn chung, sinh viên đánh giá cao trải nghiệm học tập tại trường với {positive_count} đánh giá tích cực."
-        elif negative_ratio >= 50:
-            closing = f"Nhà trường cần chú ý cải thiện các vấn đề được phản ánh trong {negative_count} đánh giá tiêu cực."
-        else:
-            closing = f"Dữ liệu cho thấy có {positive_count} đánh giá tích cực, {negative_count} tiêu cực, và {neutral_count} trung lập."
-        
-        report_parts = [opening]
-        if details:
-            report_parts.extend(details)
-        report_parts.append(closing)
-        
-        return " ".join(report_parts)
+        # Stored sentiments where available, the rest classified in one batch
+        post_sentiments = [
+            sentiments[idx] if sentiments and idx < len(sentiments) and sentiments[idx] else None
+            for idx in range(len(posts))
+        ]
+        post_scores = [scores[idx] if scores and idx < len(scores) else None for idx in range(len(posts))]
+        missing = [idx for idx, sentiment in enumerate(post_sentiments) if sentiment is None]
+        if missing:
+            scored = score_sentiments_for_summary([posts[idx].text for idx in missing])
+            for idx, (sentiment, score) in zip(missing, scored):
+                post_sentiments[idx] = sentiment
+                post_scores[idx] = score
+
+        builder = SchoolSummaryBuilder()
+        for idx, (post, sentiment) in enumerate(zip(posts, post_sentiments)):
+            title = titles[idx] if titles and idx < len(titles) else None
+            builder.add(sentiment, post.text, title, rank=example_rank(post_scores[idx], post.likes))
+        return builder.build()
     except Exception as e:
         print(f"Error in generate_school_summary_report: {e}")
         total = len(posts)
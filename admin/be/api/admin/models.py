@@ -1,34 +1,70 @@
 """
 Model loading functions for admin API
 """
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import numpy as np
+from core.config import settings
+from core.executor import inference_executor
+from untils import load_classifier, run_classifier_batches
+
+TOPIC_LABELS = np.array(["LABEL_0", "LABEL_1", "LABEL_2", "LABEL_3"])  # facility, lecturer, student, program
 
 
 def load_topic_model():
-    """Load topic classification model"""
+    """Return the shared topic model (model, tokenizer, device), loading it once per process"""
+    from core.model_registry import model_registry
+    return model_registry.get("topic")
+
+
+def _load_topic_model():
+    """Load topic classification model from disk"""
     try:
-        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        print(f"Using device for topic model: {device}")
-        
-        model = AutoModelForSequenceClassification.from_pretrained(
-            "topic_model",
-            num_labels=4,
-            device_map=device
-        )
-        model.eval()
-        
-        tokenizer = AutoTokenizer.from_pretrained("vinai/phobert-base-v2", use_fast=False)
-        
-        return model, tokenizer, device
+        model, tokenizer = load_classifier("topic", settings.TOPIC_MODEL_PATH, settings.PHOBERT_TOKENIZER,
+                                           use_fast=False, num_labels=4)
+        print(f"Using device for topic model: {model.device}")
+        return model, tokenizer, model.device
     except Exception as e:
         print(f"Error loading topic model: {str(e)}")
         return None, None, None
 
 
+def analyze_topics_batch(texts, model=None, tokenizer=None, device=None, batch_size=32, max_length=100):
+    """
+    Analyze topics of many texts in batched forward passes
+    Returns {"topics": (N,) labels, "confidences": (N,), "probabilities": (N, 4)} as numpy arrays
+    """
+    if model is None or tokenizer is None:
+        model, tokenizer, device = load_topic_model()
+    if model is None or tokenizer is None:
+        raise RuntimeError("Topic model or tokenizer is not loaded")
+
+    probabilities = run_classifier_batches(texts, model, tokenizer, batch_size=batch_size, max_length=max_length)
+    best = probabilities.argmax(axis=1)
+    return {
+        "topics": TOPIC_LABELS[best],
+        "confidences": probabilities[np.arange(len(best)), best],
+        "probabilities": probabilities,
+    }
+
+
+def warmup_topic_model(model, tokenizer, device):
+    """Run one forward pass so the first real request doesn't pay lazy-init costs"""
+    analyze_topic("Sinh viên góp ý về cơ sở vật chất của trường", model, tokenizer, device)
+
+
+def load_summary_model():
+    """Load sentence-importance model used for extractive summaries"""
+    try:
+        model, tokenizer = load_classifier("summary", settings.SUMMARY_MODEL_PATH, settings.SUMMARY_MODEL_PATH)
+        print(f"Summarization model loaded on: {model.device}")
+        return model, tokenizer
+    except Exception as e:
+        print(f"Error loading summarization model: {e}")
+        return None, None
+
+
 def analyze_topic(text, model, tokenizer, device):
     """Analyze topic of text"""
+    import torch
     try:
         if model is None or tokenizer is None:
             print("Topic model or tokenizer is not loaded")
@@ -37,7 +73,7 @@ def analyze_topic(text, model, tokenizer, device):
         inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=100)
         inputs = {k: v.to(device) for k, v in inputs.items()}
         
-        with torch.no_grad():
+        with inference_executor.slot(), torch.no_grad():
             outputs = model(**inputs)
             logits = outputs.logits
             probabilities = torch.softmax(logits, dim=1)
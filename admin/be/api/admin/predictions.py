@@ -0,0 +1,150 @@
+"""
+Persisted sentiment/topic predictions for posts
+
+Analytics endpoints read predictions from the post_predictions table and
+only run inference for posts whose row is missing or stale (content edited
+or model version changed).
+"""
+import hashlib
+import json
+from typing import Dict, Iterable, List
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from core.model_registry import model_registry
+from models.database import Post, PostPrediction
+from utils.sentiment_rollup import sync_post_rollup
+from untils import TextNormalizer, predict_sentiment_batch, get_stopword_matcher, SENTIMENT_LABELS
+
+# SQLite limits the number of bound parameters per statement
+_IN_CHUNK = 500
+
+
+def post_text(post: Post) -> str:
+    """Text used for both sentiment and topic inference"""
+    return f"{post.Title} {post.Content}" if post.Title else (post.Content or "")
+
+
+def content_hash(post: Post) -> str:
+    return hashlib.sha1(post_text(post).encode("utf-8")).hexdigest()
+
+
+def _get_stopwords():
+    from api.admin import helpers
+    if helpers.stopwords_global is None:
+        helpers.stopwords_global = get_stopword_matcher()
+    return helpers.stopwords_global
+
+
+def load_predictions(db: Session, post_ids: Iterable[int]) -> Dict[int, PostPrediction]:
+    """Fetch stored predictions for the given post IDs"""
+    post_ids = list(post_ids)
+    stored = {}
+    for start in range(0, len(post_ids), _IN_CHUNK):
+        chunk = post_ids[start:start + _IN_CHUNK]
+        for prediction in db.query(PostPrediction).filter(PostPrediction.PostID.in_(chunk)):
+            stored[prediction.PostID] = prediction
+    return stored
+
+
+def ensure_predictions(db: Session, posts: List[Post], sentiment: bool = True,
+                       topic: bool = True) -> Dict[int, PostPrediction]:
+    """
+    Return {PostID: PostPrediction} for posts, running batched inference only
+    for rows that are missing or stale, and persisting the new results.
+    """
+    if not posts:
+        return {}
+
+    stored = load_predictions(db, (post.PostID for post in posts))
+    sentiment_version = model_registry.version("sentiment") if sentiment else None
+    topic_version = model_registry.version("topic") if topic else None
+
+    need_sentiment = []
+    need_topic = []
+    for post in posts:
+        digest = content_hash(post)
+        prediction = stored.get(post.PostID)
+        if prediction is None:
+            prediction = PostPrediction(PostID=post.PostID, ContentHash=digest)
+            db.add(prediction)
+            stored[post.PostID] = prediction
+        elif prediction.ContentHash != digest:
+            # Content edited: every stored result for this post is stale
+            prediction.ContentHash = digest
+            prediction.SentimentModelVersion = None
+            prediction.TopicModelVersion = None
+
+        if sentiment and prediction.SentimentModelVersion != sentiment_version:
+            need_sentiment.append(post)
+        if topic and prediction.TopicModelVersion != topic_version:
+            need_topic.append(post)
+
+    if need_sentiment:
+        _score_sentiment(need_sentiment, stored, sentiment_version)
+    if need_topic:
+        _score_topic(need_topic, stored, topic_version)
+
+    # Keep sentiment_daily_rollup in line (no SQL unless a post's bucket moved)
+    rollup_changed = False
+    for post in posts:
+        rollup_changed |= sync_post_rollup(db, post, stored[post.PostID])
+
+    if need_sentiment or need_topic or rollup_changed:
+        print(f"Inference: {len(need_sentiment)} sentiment, {len(need_topic)} topic "
+              f"of {len(posts)} posts (rest from post_predictions)")
+        try:
+            commit_keep_loaded(db)
+        except IntegrityError:
+            # The background worker stored the same post concurrently;
+            # the results computed here are still valid for this request
+            print("Predictions stored concurrently, keeping in-memory results")
+    return stored
+
+
+def commit_keep_loaded(db: Session):
+    """
+    Commit without expiring loaded objects, so callers can keep reading the
+    posts they passed in without one refresh query per post
+    """
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
+def _score_sentiment(posts: List[Post], stored: Dict[int, PostPrediction], version: str):
+    sentiment_classifier, _ = model_registry.get("sentiment")
+    if not sentiment_classifier:
+        raise Exception("Failed to load sentiment model")
+
+    normalizer = TextNormalizer(remove_emoji=True, lowercase=True,
+                                stopwords=_get_stopwords(), remove_special=True)
+    texts = normalizer.normalize_many([post_text(post) for post in posts])
+    results = predict_sentiment_batch(texts, sentiment_classifier, cache_options="post")
+    for post, result in zip(posts, results):
+        prediction = stored[post.PostID]
+        prediction.SentimentLabel = SENTIMENT_LABELS[result["label"]]
+        prediction.SentimentScore = result["score"]
+        prediction.SentimentModelVersion = version
+
+
+def _score_topic(posts: List[Post], stored: Dict[int, PostPrediction], version: str):
+    from api.admin.models import analyze_topics_batch
+    topic_model, topic_tokenizer, topic_device = model_registry.get("topic")
+    if not topic_model or not topic_tokenizer:
+        raise Exception("Failed to load topic model")
+
+    result = analyze_topics_batch([post_text(post) for post in posts],
+                                  topic_model, topic_tokenizer, topic_device)
+    for post, label, confidence, probabilities in zip(
+            posts, result["topics"], result["confidences"], result["probabilities"]):
+        prediction = stored[post.PostID]
+        prediction.TopicLabel = str(label)
+        prediction.TopicConfidence = float(confidence)
+        prediction.TopicProbabilities = json.dumps([round(float(p), 6) for p in probabilities])
+        prediction.TopicModelVersion = version
@@ -2,6 +2,9 @@
 Health check endpoints
 """
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from core.config import settings
+from core.model_registry import model_registry
 
 router = APIRouter()
 
@@ -20,3 +23,21 @@ async def health_detailed():
         "service": "Client API",
         "version": "1.0.0"
     }
+
+
+@router.get("/live")
+async def health_live():
+    """Liveness: the process is up and the event loop answers"""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def health_ready():
+    """Readiness: 200 once the preloaded ML models are loaded, 503 before (or if one failed)"""
+    required = settings.MODEL_PRELOAD if settings.MODEL_LOADING != "lazy" else []
+    models = {name: model_registry.state(name) for name in model_registry.names()}
+    ready = all(models.get(name) == "loaded" for name in required)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "loading": settings.MODEL_LOADING, "models": models},
+    )
@@ -5,10 +5,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 from core.database import get_db
+from core.summary_cache import summary_cache
 from models.database import Post, PostStatus, User
 from models.schemas import (
     PostCreate, PostUpdate, PostResponse, PostListResponse, CommentListResponse
 )
+from utils.inference_worker import enqueue_post
+from utils.sentiment_rollup import mark_prediction_stale, sync_post_rollup
 
 router = APIRouter()
 
@@ -29,6 +32,9 @@ async def create_post(post: PostCreate, db: Session = Depends(get_db)):
         db.add(db_post)
         db.commit()
         db.refresh(db_post)
+        # Classify sentiment/topic in the background for admin analytics
+        enqueue_post(db_post.PostID)
+        summary_cache.invalidate(f"post {db_post.PostID} created")
         return db_post
     except Exception as e:
         db.rollback()
@@ -119,9 +125,21 @@ async def update_post(
             post.Category = post_update.Category
         if post_update.Status is not None:
             post.Status = post_update.Status
+        content_changed = post_update.Title is not None or post_update.Content is not None
+        if content_changed:
+            # Stored sentiment/topic no longer match the text: mark them stale
+            # and take the post out of the rollup in the same transaction
+            mark_prediction_stale(db, post)
+        else:
+            # Status/category changes move the post between sentiment rollup buckets
+            sync_post_rollup(db, post)
         
         db.commit()
         db.refresh(post)
+        if content_changed:
+            # Re-classify edited content in the background
+            enqueue_post(post.PostID)
+        summary_cache.invalidate(f"post {post.PostID} updated")
         return post
     except Exception as e:
         db.rollback()
@@ -137,7 +155,9 @@ async def delete_post(post_id: int, db: Session = Depends(get_db)):
     
     try:
         post.Status = PostStatus.DELETED.value
+        sync_post_rollup(db, post)
         db.commit()
+        summary_cache.invalidate(f"post {post_id} deleted")
         return None
     except Exception as e:
         db.rollback()
@@ -255,6 +275,8 @@ async def like_post(
         liked = True
     
     db.commit()
+    # Upvotes rank the summary report's examples
+    summary_cache.invalidate(f"post {post_id} {'liked' if liked else 'unliked'}")
     db.refresh(post)
     
     return {
@@ -276,7 +298,9 @@ async def update_post_status(
     
     try:
         post.Status = status
+        sync_post_rollup(db, post)
         db.commit()
+        summary_cache.invalidate(f"post {post_id} status {status}")
         db.refresh(post)
         return post
     except Exception as e:
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import Optional
 from core.database import get_db
+from core.summary_cache import summary_cache
 from models.database import Vote, Post
 from models.schemas import VoteCreate, VoteResponse, VoteListResponse
 
@@ -31,6 +32,7 @@ async def create_vote(vote: VoteCreate, db: Session = Depends(get_db)):
                     post.DownVotes = max(0, post.DownVotes - 1)
                 db.delete(existing_vote)
                 db.commit()
+                summary_cache.invalidate(f"vote on post {vote.PostID}")
                 raise HTTPException(status_code=200, detail="Vote removed")
             
             if old_vote_type == "up":
@@ -42,6 +44,7 @@ async def create_vote(vote: VoteCreate, db: Session = Depends(get_db)):
             
             existing_vote.VoteType = vote.VoteType
             db.commit()
+            summary_cache.invalidate(f"vote on post {vote.PostID}")
             db.refresh(existing_vote)
             return existing_vote
         else:
@@ -54,6 +57,7 @@ async def create_vote(vote: VoteCreate, db: Session = Depends(get_db)):
                 post.DownVotes += 1
             
             db.commit()
+            summary_cache.invalidate(f"vote on post {vote.PostID}")
             db.refresh(db_vote)
             return db_vote
     except HTTPException:
@@ -115,6 +119,7 @@ async def delete_vote(vote_id: int, db: Session = Depends(get_db)):
         
         db.delete(vote)
         db.commit()
+        summary_cache.invalidate(f"vote on post {vote.PostID} deleted")
         return None
     except Exception as e:
         db.rollback()
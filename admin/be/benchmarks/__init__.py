@@ -0,0 +1 @@
+# Benchmark scripts (run from admin/be, e.g. python benchmarks/bench_sentiment_batch.py)
@@ -0,0 +1,42 @@
+"""
+Benchmark: sentiment throughput (posts/sec) by batch size on CPU
+Run with: python benchmarks/bench_sentiment_batch.py [--posts 512]
+"""
+import argparse
+import os
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")  # CPU benchmark
+
+import torch
+from common import load_csv_texts, timed
+from core.config import settings
+from untils import load_sentiment_model, get_stopword_matcher, preprocess_text, predict_sentiment_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=512)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    classifier, _ = load_sentiment_model(settings.SENTIMENT_MODEL_PATH, settings.PHOBERT_TOKENIZER)
+    stopwords = get_stopword_matcher()
+    texts = [
+        preprocess_text(t, remove_emoji=True, lowercase=True,
+                        remove_stopwords=True, stopwords=stopwords, remove_special=True)
+        for t in load_csv_texts(args.posts)[:args.posts]
+    ]
+    print(f"{len(texts)} posts, torch threads={torch.get_num_threads()}")
+
+    # Baseline: the previous per-post pipeline loop
+    seconds, _ = timed(lambda: [classifier(t, truncation=True, max_length=100) for t in texts])
+    print(f"{'pipeline loop':>14}: {len(texts) / seconds:8.1f} posts/sec")
+
+    for batch_size in args.batch_sizes:
+        seconds, _ = timed(predict_sentiment_batch, texts, classifier,
+                           batch_size=batch_size, repeat=args.repeat)
+        print(f"{'batch ' + str(batch_size):>14}: {len(texts) / seconds:8.1f} posts/sec")
+
+
+if __name__ == "__main__":
+    main()
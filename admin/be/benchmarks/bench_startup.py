@@ -0,0 +1,70 @@
+"""
+Benchmark: server start -> first healthy response, and -> models ready, per MODEL_LOADING mode
+Run with: python benchmarks/bench_startup.py [--modes eager background lazy]
+
+Each mode starts `uvicorn server:app` in a fresh process and polls
+/client/health and /client/health/ready every 50 ms.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from common import BE_DIR
+
+
+def poll(url, deadline, expect_status=200):
+    """Seconds until url returns expect_status, or None on timeout"""
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == expect_status:
+                    return json.loads(response.read() or b"{}")
+        except urllib.error.HTTPError as e:
+            if e.code == expect_status:
+                return {}
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    return None
+
+
+def measure(mode, port, timeout):
+    env = {**os.environ, "MODEL_LOADING": mode, "INFERENCE_WORKER_ENABLED": "false"}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + timeout
+        base = f"http://127.0.0.1:{port}/client/health"
+        healthy = poll(base, deadline)
+        healthy_seconds = time.perf_counter() - started if healthy is not None else None
+        ready = poll(base + "/ready", deadline)
+        ready_seconds = time.perf_counter() - started if ready is not None else None
+        return healthy_seconds, ready_seconds, (ready or {}).get("models")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modes", nargs="+", default=["eager", "background", "lazy"])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    print(f"{'mode':>12} | {'first /health':>14} | {'ready':>10} | models")
+    for mode in args.modes:
+        healthy, ready, models = measure(mode, args.port, args.timeout)
+        fmt = lambda value: f"{value:.2f}s" if value is not None else "timeout"
+        print(f"{mode:>12} | {fmt(healthy):>14} | {fmt(ready):>10} | {models}")
+
+
+if __name__ == "__main__":
+    main()
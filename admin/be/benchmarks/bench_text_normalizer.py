@@ -0,0 +1,65 @@
+"""
+Benchmark: TextNormalizer vs the previous preprocess_text implementation
+Run with: python benchmarks/bench_text_normalizer.py [--posts 20000]
+"""
+import argparse
+import re
+from common import load_csv_texts, timed
+from untils import TextNormalizer, load_stopwords, filter_stop_words
+
+
+# Previous implementation, kept verbatim as the baseline and equivalence reference
+def legacy_deEmojify(text):
+    regrex_pattern = re.compile(pattern="["
+        u"\U0001F600-\U0001F64F"
+        u"\U0001F300-\U0001F5FF"
+        u"\U0001F680-\U0001F6FF"
+        u"\U0001F1E0-\U0001F1FF"
+        "]+", flags=re.UNICODE)
+    return regrex_pattern.sub(r'', text)
+
+
+def legacy_remove_special_chars_and_numbers(text):
+    text = re.sub(r'[^\w\s\u00C0-\u1EF9]', ' ', text)
+    text = re.sub(r'[^\w\s\u00C0-\u1EF9]*\d+[^\w\s\u00C0-\u1EF9]*', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def legacy_preprocess_text(text, remove_stopwords=False, stopwords=None,
+                           remove_emoji=True, lowercase=True, remove_special=True):
+    if remove_emoji:
+        text = legacy_deEmojify(text)
+    if remove_special:
+        text = legacy_remove_special_chars_and_numbers(text)
+    if remove_stopwords and stopwords:
+        text = filter_stop_words(text, stopwords)
+    if lowercase:
+        text = text.lower()
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = load_csv_texts(args.posts)[:args.posts]
+    stopwords = load_stopwords("data/vietnamese-stopwords.txt")
+    normalizer = TextNormalizer(remove_emoji=True, lowercase=True, stopwords=stopwords, remove_special=True)
+
+    legacy_seconds, expected = timed(
+        lambda: [legacy_preprocess_text(t, remove_stopwords=True, stopwords=stopwords) for t in texts],
+        repeat=args.repeat)
+    seconds, actual = timed(normalizer.normalize_many, texts, repeat=args.repeat)
+
+    mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+    print(f"{len(texts)} posts, {mismatches} output mismatches")
+    print(f"{'preprocess_text (old)':>22}: {len(texts) / legacy_seconds:10.1f} posts/sec")
+    print(f"{'TextNormalizer':>22}: {len(texts) / seconds:10.1f} posts/sec "
+          f"({legacy_seconds / seconds:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
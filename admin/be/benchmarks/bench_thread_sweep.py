@@ -0,0 +1,91 @@
+"""
+Benchmark: aggregate sentiment throughput for worker count x torch threads per worker
+Run with: python benchmarks/bench_thread_sweep.py [--workers 1 2 4] [--threads 1 2 4 8] [--pin]
+
+Each configuration starts `workers` processes (as uvicorn/gunicorn workers
+would run), each applying the threading policy from core/torch_threads.py,
+and lets them classify the same CSV posts concurrently in batches of
+SENTIMENT_BATCH_SIZE. Reports total posts/sec and p95 batch latency.
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from common import load_csv_texts
+
+
+def worker(index, threads, workers, pin, texts, barrier, results):
+    os.environ.update({
+        "CUDA_VISIBLE_DEVICES": "",
+        "TORCH_NUM_THREADS": str(threads),
+        "WEB_CONCURRENCY": str(workers),
+        "TORCH_CPU_AFFINITY": "true" if pin else "false",
+        "WORKER_INDEX": str(index),
+        "INFERENCE_CACHE_ENABLED": "false",
+    })
+    from core.config import settings
+    from core.model_registry import model_registry
+    from untils import predict_sentiment_batch
+
+    classifier, _ = model_registry.get("sentiment")
+    batch_size = settings.SENTIMENT_BATCH_SIZE
+    predict_sentiment_batch(texts[:batch_size], classifier)  # warm-up
+
+    barrier.wait()
+    latencies = []
+    started = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        batch_started = time.perf_counter()
+        predict_sentiment_batch(texts[start:start + batch_size], classifier)
+        latencies.append(time.perf_counter() - batch_started)
+    results.put((len(texts), time.perf_counter() - started, latencies))
+
+
+def run(workers, threads, pin, texts):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(i, threads, workers, pin, texts, barrier, results))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    outputs = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    posts = sum(count for count, _, _ in outputs)
+    wall = max(seconds for _, seconds, _ in outputs)
+    latencies = sorted(latency for _, _, batch in outputs for latency in batch)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    return posts / wall, p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=256, help="posts per worker")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--pin", action="store_true", help="pin each worker to its slice of cores")
+    args = parser.parse_args()
+
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    texts = load_csv_texts(args.posts)[:args.posts]
+    print(f"{cores} cores, {args.posts} posts per worker, pin={args.pin}")
+    print(f"{'workers':>8} {'threads':>8} {'total thr':>10} {'posts/sec':>10} {'p95 batch':>10}")
+
+    best = None
+    for workers in args.workers:
+        for threads in args.threads:
+            throughput, p95 = run(workers, threads, args.pin, texts)
+            flag = " (oversubscribed)" if workers * threads > cores else ""
+            print(f"{workers:>8} {threads:>8} {workers * threads:>10} {throughput:>10.1f} {p95 * 1000:>8.0f}ms{flag}")
+            if best is None or throughput > best[0]:
+                best = (throughput, workers, threads)
+    print(f"\nBest: {best[1]} workers x {best[2]} threads = {best[0]:.1f} posts/sec "
+          f"(set WEB_CONCURRENCY={best[1]} TORCH_NUM_THREADS={best[2]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: memory per worker, `uvicorn --workers N` vs pre-fork `gunicorn -c gunicorn.conf.py`
+Run with: python benchmarks/bench_worker_rss.py [--workers 4] [--requests 20]  (Linux only)
+
+Each server is started, warmed with a few /sentiment requests (so workers have
+run real inference), then /proc/<pid>/smaps_rollup is read for the master
+and every worker. PSS splits shared pages between the processes mapping
+them, so the PSS total is the real memory cost of the deployment.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from common import BE_DIR
+from bench_startup import poll
+
+FIELDS = ["Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty"]
+
+
+def smaps_rollup(pid):
+    """{field: MB} from /proc/<pid>/smaps_rollup"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as file:
+        for line in file:
+            parts = line.split()
+            if parts and parts[0].rstrip(":") in FIELDS:
+                values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return values
+
+
+def children(pid):
+    result = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as file:
+                # Field 4 is the parent PID; the command name may contain spaces
+                ppid = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            result.append(int(entry))
+    return result
+
+
+def wait_all_ready(port, deadline, consecutive=20):
+    """
+    Workers answer round-robin-ish, so one 200 only proves one worker is ready;
+    wait for a run of consecutive 200s from /client/health/ready
+    """
+    if poll(f"http://127.0.0.1:{port}/client/health/ready", deadline) is None:
+        return False
+    streak = 0
+    while streak < consecutive and time.perf_counter() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/client/health/ready", timeout=5).read()
+            streak += 1
+        except OSError:
+            streak = 0
+            time.sleep(0.5)
+    return streak >= consecutive
+
+
+def exercise(port, count):
+    body = json.dumps({"data": [{"text": "Phòng học sạch sẽ, giảng viên nhiệt tình"}] * 8}).encode("utf-8")
+    for _ in range(count):
+        request = urllib.request.Request(f"http://127.0.0.1:{port}/sentiment", data=body,
+                                         headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(request, timeout=120).read()
+
+
+def measure(label, command, port, requests, timeout):
+    env = {**os.environ, "INFERENCE_WORKER_ENABLED": "false", "MODEL_LOADING": "eager"}
+    process = subprocess.Popen(command, cwd=BE_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_all_ready(port, time.perf_counter() + timeout):
+            print(f"{label}: server not ready after {timeout}s")
+            return
+        exercise(port, requests)
+
+        pids = [process.pid] + children(process.pid)
+        print(f"\n{label}")
+        print(f"{'pid':>8} {'role':>7} " + " ".join(f"{field:>13}" for field in FIELDS))
+        total_pss = 0.0
+        for pid in pids:
+            stats = smaps_rollup(pid)
+            total_pss += stats.get("Pss", 0)
+            role = "master" if pid == process.pid else "worker"
+            print(f"{pid:>8} {role:>7} " + " ".join(f"{stats.get(field, 0):>10.0f} MB" for field in FIELDS))
+        print(f"{'total PSS':>16}: {total_pss:.0f} MB for {len(pids) - 1} workers")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    measure("uvicorn --workers (each worker loads its own models)",
+            [sys.executable, "-m", "uvicorn", "server:app", "--port", str(args.port), "--workers", str(args.workers)],
+            args.port, args.requests, args.timeout)
+    measure("gunicorn pre-fork (models shared from the master)",
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "server:app",
+             "--bind", f"127.0.0.1:{args.port}", "--workers", str(args.workers)],
+            args.port, args.requests, args.timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Shared helpers for benchmark scripts
+"""
+import csv
+import os
+import sys
+import time
+
+BE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BE_DIR not in sys.path:
+    sys.path.insert(0, BE_DIR)
+
+CSV_FILES = ["Utc2Confessions.csv", "Utc2Zone.csv", "Utc2NoiChiaSeCamXuc.csv", "DienDanNgheSVNoi.csv"]
+
+
+def load_csv_texts(min_count: int = 0):
+    """Load post texts from the bundled CSVs, repeated until at least min_count texts"""
+    texts = []
+    for name in CSV_FILES:
+        with open(os.path.join(BE_DIR, "data", name), mode="r", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                if row.get("Text"):
+                    texts.append(row["Text"])
+    if not texts:
+        raise RuntimeError("No texts found in data/*.csv")
+    result = list(texts)
+    while len(result) < min_count:
+        result.extend(texts)
+    return result
+
+
+def timed(fn, *args, repeat: int = 1, **kwargs):
+    """Return (best seconds, last result) over `repeat` runs"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
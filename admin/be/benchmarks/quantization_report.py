@@ -0,0 +1,105 @@
+"""
+Report: fp32 vs dynamic int8 (MODEL_QUANTIZE_INT8) for the sentiment, topic and summary models
+Run with: python benchmarks/quantization_report.py [--posts 1000] [--output quantization_report.md]
+
+The bundled CSVs carry no gold labels, so accuracy is reported as agreement
+with the fp32 model (same argmax label) plus the probability drift.
+"""
+import argparse
+import copy
+import io
+import os
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")  # quantization is CPU only
+
+import numpy as np
+import torch
+from common import load_csv_texts, timed
+from core.config import settings
+from underthesea import sent_tokenize
+from untils import (load_sentiment_model, get_stopword_matcher, TextNormalizer,
+                    run_classifier_batches, quantize_dynamic_int8)
+
+
+def model_size_mb(model):
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+
+def compare(name, model, tokenizer, texts, batch_size, repeat):
+    quantized = quantize_dynamic_int8(copy.deepcopy(model).eval())
+
+    fp32_seconds, fp32_probs = timed(run_classifier_batches, texts, model, tokenizer,
+                                     batch_size=batch_size, repeat=repeat)
+    int8_seconds, int8_probs = timed(run_classifier_batches, texts, quantized, tokenizer,
+                                     batch_size=batch_size, repeat=repeat)
+
+    drift = np.abs(fp32_probs - int8_probs)
+    return {
+        "model": name,
+        "texts": len(texts),
+        "agreement": float((fp32_probs.argmax(axis=1) == int8_probs.argmax(axis=1)).mean()),
+        "mean_drift": float(drift.mean()),
+        "max_drift": float(drift.max()),
+        "fp32_ms": 1000 * fp32_seconds / len(texts),
+        "int8_ms": 1000 * int8_seconds / len(texts),
+        "fp32_mb": model_size_mb(model),
+        "int8_mb": model_size_mb(quantized),
+    }
+
+
+def to_markdown(rows):
+    lines = [
+        f"torch {torch.__version__}, threads={torch.get_num_threads()}, CPU",
+        "",
+        "| model | texts | label agreement | mean / max prob drift | fp32 ms/text | int8 ms/text | speedup | fp32 MB | int8 MB |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    for r in rows:
+        lines.append(
+            f"| {r['model']} | {r['texts']} | {r['agreement']:.2%} | {r['mean_drift']:.4f} / {r['max_drift']:.4f} "
+            f"| {r['fp32_ms']:.2f} | {r['int8_ms']:.2f} | {r['fp32_ms'] / r['int8_ms']:.2f}x "
+            f"| {r['fp32_mb']:.0f} | {r['int8_mb']:.0f} |"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=settings.SENTIMENT_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", help="also write the markdown table to this file")
+    args = parser.parse_args()
+
+    # Always start from the fp32 weights, whatever the environment says
+    settings.MODEL_QUANTIZE_INT8 = False
+    posts = load_csv_texts(args.posts)[:args.posts]
+    rows = []
+
+    classifier, _ = load_sentiment_model(settings.SENTIMENT_MODEL_PATH, settings.PHOBERT_TOKENIZER)
+    normalizer = TextNormalizer(stopwords=get_stopword_matcher())
+    rows.append(compare("sentiment", classifier.model, classifier.tokenizer,
+                        normalizer.normalize_many(posts), args.batch_size, args.repeat))
+    del classifier
+
+    from api.admin.models import _load_topic_model, load_summary_model
+    topic_model, topic_tokenizer, _ = _load_topic_model()
+    if topic_model is not None:
+        rows.append(compare("topic", topic_model, topic_tokenizer, posts, args.batch_size, args.repeat))
+        del topic_model
+
+    summary_model, summary_tokenizer = load_summary_model()
+    if summary_model is not None:
+        sentences = [s for post in posts for s in sent_tokenize(post) if len(s.split()) >= 5][:args.posts]
+        rows.append(compare("summary", summary_model, summary_tokenizer, sentences, args.batch_size, args.repeat))
+
+    report = to_markdown(rows)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,64 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # ML models (admin API)
+    SENTIMENT_MODEL_PATH: str = "fine_tuned_model"
+    TOPIC_MODEL_PATH: str = "topic_model"
+    SUMMARY_MODEL_PATH: str = "./summary_model_final"
+    PHOBERT_TOKENIZER: str = "vinai/phobert-base-v2"
+    SENTIMENT_BATCH_SIZE: int = 32
+    SENTIMENT_MAX_LENGTH: int = 100
+    PHRASE_BATCH_SIZE: int = 256  # word/phrase windows in /word-analysis
+    SUMMARY_BATCH_SIZE: int = 64  # sentences per forward pass in extractive summaries
+    SUMMARY_MAX_LENGTH: int = 256
+    # eager: load at import (old behaviour), background: serve immediately and load
+    # MODEL_PRELOAD on a thread after startup, lazy: load each model on first use
+    MODEL_LOADING: str = "background"
+    MODEL_PRELOAD: List[str] = ["sentiment", "summary", "topic"]
+    # torch threading per process (applied before the first model load):
+    # 0 threads = cores / WEB_CONCURRENCY; affinity pins each worker to its slice of cores
+    WEB_CONCURRENCY: int = 1
+    TORCH_NUM_THREADS: int = 0
+    TORCH_INTEROP_THREADS: int = 1
+    TORCH_CPU_AFFINITY: bool = False
+    MODEL_WARMUP: bool = True  # gunicorn.conf.py turns this off in the master (warm-up runs per worker)
+    STOPWORDS_PATH: str = "data/vietnamese-stopwords.txt"
+    # Dynamic int8 quantization of Linear layers (CPU only); see benchmarks/quantization_report.py
+    MODEL_QUANTIZE_INT8: bool = False
+    # "torch" (eager PyTorch), "onnx" (ONNX Runtime CPU, models exported by export_onnx.py)
+    # or "remote" (inference_server.py over a Unix socket)
+    INFERENCE_BACKEND: str = "torch"
+    ONNX_MODEL_DIR: str = "onnx_models"
+    ONNX_INTRA_OP_THREADS: int = 0  # 0 = same as torch threads (core/torch_threads.py)
+    # INFERENCE_BACKEND=remote: models live in inference_server.py behind this socket
+    INFERENCE_SOCKET_PATH: str = "/tmp/admin-inference.sock"
+    INFERENCE_RPC_TIMEOUT: float = 60.0
+    INFERENCE_SERVER_BACKEND: str = "torch"  # backend used inside inference_server.py
+    
+    # Shared LRU cache of sentiment results (keyed by model version + text hash)
+    INFERENCE_CACHE_ENABLED: bool = True
+    INFERENCE_CACHE_MAX_ENTRIES: int = 100000
+    INFERENCE_CACHE_MAX_MB: int = 64
+    # Generated /school-summary-2 reports, rebuilt only when the posts they cover change
+    SUMMARY_CACHE_ENABLED: bool = True
+    SUMMARY_CACHE_MAX_ENTRIES: int = 32
+    
+    # Background inference worker (classifies posts on create/update)
+    INFERENCE_WORKER_ENABLED: bool = True
+    INFERENCE_QUEUE_SIZE: int = 1000
+    INFERENCE_BATCH_SIZE: int = 32
+    INFERENCE_MAX_RETRIES: int = 3
+
+    # Inference executor: async endpoints offload DB + model work to this pool;
+    # at most INFERENCE_MAX_CONCURRENCY forward passes run at once process-wide
+    INFERENCE_EXECUTOR_WORKERS: int = 4
+    INFERENCE_MAX_CONCURRENCY: int = 1
+
+    # Micro-batching of concurrent /sentiment and /word-analysis requests
+    MICRO_BATCH_ENABLED: bool = True
+    MICRO_BATCH_MAX_SIZE: int = 128  # texts per flush
+    MICRO_BATCH_MAX_WAIT_MS: float = 5.0
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
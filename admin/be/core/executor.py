@@ -0,0 +1,86 @@
+"""
+Dedicated executor for blocking model inference
+
+Async endpoints await `inference_executor.run(fn, ...)` so SQLAlchemy queries
+and forward passes run on the inference thread pool instead of the event loop.
+Every forward pass (from any thread: the pool, FastAPI's sync endpoint pool,
+the background worker) also takes one of `INFERENCE_MAX_CONCURRENCY` slots,
+so concurrent requests can't oversubscribe the CPU with parallel model calls.
+"""
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from core.config import settings
+
+
+class InferenceExecutor:
+    """Thread pool for ML request handlers plus a semaphore bounding concurrent forward passes"""
+
+    def __init__(self, max_workers: int = 4, max_concurrency: int = 1):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.waiting_for_slot = 0
+        self.completed = 0
+        self.slot_wait_seconds = 0.0
+
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking callable on the inference pool and await its result"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.queued += 1
+        return await loop.run_in_executor(self._pool, functools.partial(self._call, fn, *args, **kwargs))
+
+    def _call(self, fn, *args, **kwargs):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    @contextmanager
+    def slot(self):
+        """Hold one inference slot for the duration of a forward pass"""
+        started = time.perf_counter()
+        with self._lock:
+            self.waiting_for_slot += 1
+        self._slots.acquire()
+        with self._lock:
+            self.waiting_for_slot -= 1
+            self.slot_wait_seconds += time.perf_counter() - started
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_concurrency": self.max_concurrency,
+                "queued": self.queued,
+                "running": self.running,
+                "waiting_for_slot": self.waiting_for_slot,
+                "completed": self.completed,
+                "slot_wait_seconds": round(self.slot_wait_seconds, 3),
+            }
+
+
+inference_executor = InferenceExecutor(
+    max_workers=settings.INFERENCE_EXECUTOR_WORKERS,
+    max_concurrency=settings.INFERENCE_MAX_CONCURRENCY,
+)
@@ -0,0 +1,87 @@
+"""
+Bounded LRU cache for classifier outputs
+
+Keys are (model version, preprocessing options, sha1 of the normalized text),
+values are small (label, score) tuples. Entries are evicted least recently
+used first when either the entry limit or the approximate memory limit is hit.
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+from core.config import settings
+
+
+class InferenceCache:
+    """Thread-safe LRU cache with size- and memory-based eviction and hit/miss counters"""
+
+    def __init__(self, max_entries: int = 100_000, max_bytes: int = 64 * 1024 * 1024, enabled: bool = True):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(prefix: Tuple[Hashable, ...], text: str) -> Tuple:
+        return prefix + (hashlib.sha1(text.encode("utf-8")).hexdigest(),)
+
+    @staticmethod
+    def _entry_size(key: Tuple, value: Tuple) -> int:
+        return (sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key)
+                + sys.getsizeof(value) + sum(sys.getsizeof(part) for part in value))
+
+    def get(self, key: Tuple) -> Optional[Tuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple, value: Tuple):
+        size = self._entry_size(key, value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "approx_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+sentiment_cache = InferenceCache(
+    max_entries=settings.INFERENCE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.INFERENCE_CACHE_MAX_MB * 1024 * 1024,
+    enabled=settings.INFERENCE_CACHE_ENABLED,
+)
@@ -0,0 +1,196 @@
+"""
+Binary RPC between the admin API and inference_server.py over a Unix socket
+(Settings.INFERENCE_BACKEND = "remote")
+
+API workers keep only tokenizers; token ids go to the inference server, which
+owns the model weights and returns logits. Every message is one frame:
+
+    uint32 payload length | payload
+
+Request payload:   uint8 op | uint8 model | uint32 rows | rows x uint16 lengths | sum(lengths) x int32 ids
+    op 1 = info      (rows = 0)   -> JSON {"num_labels", "id2label", "version"}
+    op 2 = classify  (token rows) -> logits
+Response payload:  uint8 status (0 ok, 1 error) | body
+    info:     utf-8 JSON
+    classify: uint32 rows | uint16 labels | rows x labels float32 logits
+    error:    utf-8 message
+
+All integers and floats are little-endian.
+"""
+import json
+import os
+import socket
+import struct
+import threading
+from types import SimpleNamespace
+from typing import List, Tuple
+import numpy as np
+from core.config import settings
+
+OP_INFO = 1
+OP_CLASSIFY = 2
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+MODEL_IDS = {"sentiment": 0, "topic": 1, "summary": 2}
+MODEL_NAMES = {model_id: name for name, model_id in MODEL_IDS.items()}
+
+_FRAME = struct.Struct("<I")
+_REQUEST = struct.Struct("<BBI")
+_LOGITS = struct.Struct("<IH")
+
+
+class RemoteInferenceError(Exception):
+    """The inference server is unreachable or reported an error"""
+
+
+def recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("inference socket closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_frame(sock: socket.socket, payload: bytes):
+    sock.sendall(_FRAME.pack(len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> bytes:
+    (size,) = _FRAME.unpack(recv_exact(sock, _FRAME.size))
+    return recv_exact(sock, size)
+
+
+def encode_request(op: int, model: str, rows: List[np.ndarray] = ()) -> bytes:
+    lengths = np.array([len(row) for row in rows], dtype="<u2")
+    ids = np.concatenate(rows).astype("<i4") if len(rows) else np.zeros(0, dtype="<i4")
+    return _REQUEST.pack(op, MODEL_IDS[model], len(rows)) + lengths.tobytes() + ids.tobytes()
+
+
+def decode_request(payload: bytes) -> Tuple[int, str, List[np.ndarray]]:
+    op, model_id, count = _REQUEST.unpack_from(payload)
+    offset = _REQUEST.size
+    lengths = np.frombuffer(payload, dtype="<u2", count=count, offset=offset)
+    offset += lengths.nbytes
+    ids = np.frombuffer(payload, dtype="<i4", offset=offset)
+    rows = np.split(ids, np.cumsum(lengths)[:-1]) if count else []
+    return op, MODEL_NAMES[model_id], rows
+
+
+def encode_logits(logits: np.ndarray) -> bytes:
+    logits = np.ascontiguousarray(logits, dtype="<f4")
+    return bytes([STATUS_OK]) + _LOGITS.pack(*logits.shape) + logits.tobytes()
+
+
+def encode_json(value) -> bytes:
+    return bytes([STATUS_OK]) + json.dumps(value).encode("utf-8")
+
+
+def encode_error(message: str) -> bytes:
+    return bytes([STATUS_ERROR]) + message.encode("utf-8")
+
+
+class InferenceClient:
+    """One connection per thread to the inference server, reconnecting once on failure"""
+
+    def __init__(self, socket_path: str, timeout: float):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self._local.sock = sock
+        return sock
+
+    def reset(self):
+        """
+        Forget this thread's connection. Runs in every forked child: the socket
+        inherited from the parent is shared with it (and with sibling workers),
+        so frames from different processes would interleave on it.
+        """
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            # Closes only this process's descriptor; the parent's connection stays usable
+            sock.close()
+        self._local.sock = None
+
+    def _call(self, payload: bytes) -> bytes:
+        for attempt in range(2):
+            sock = getattr(self._local, "sock", None)
+            try:
+                if sock is None:
+                    sock = self._connect()
+                send_frame(sock, payload)
+                response = recv_frame(sock)
+                break
+            except (OSError, ConnectionError) as e:
+                if sock is not None:
+                    sock.close()
+                self._local.sock = None
+                if attempt:
+                    raise RemoteInferenceError(f"inference server at {self.socket_path}: {e}") from e
+        if response[0] != STATUS_OK:
+            raise RemoteInferenceError(response[1:].decode("utf-8", "replace"))
+        return response[1:]
+
+    def info(self, model: str) -> dict:
+        return json.loads(self._call(encode_request(OP_INFO, model)).decode("utf-8"))
+
+    def classify(self, model: str, rows: List[np.ndarray]) -> np.ndarray:
+        body = self._call(encode_request(OP_CLASSIFY, model, rows))
+        count, labels = _LOGITS.unpack_from(body)
+        return np.frombuffer(body, dtype="<f4", offset=_LOGITS.size).reshape(count, labels)
+
+
+inference_client = InferenceClient(settings.INFERENCE_SOCKET_PATH, settings.INFERENCE_RPC_TIMEOUT)
+if hasattr(os, "register_at_fork"):
+    # Pre-fork deployments load models (and so connect) in the master
+    os.register_at_fork(after_in_child=inference_client.reset)
+
+
+class RemoteSequenceClassifier:
+    """
+    Drop-in for AutoModelForSequenceClassification whose forward pass runs in
+    inference_server.py: `model(**batch).logits`, `.config`, `.device`
+    """
+
+    def __init__(self, name: str, client: InferenceClient = inference_client):
+        import torch
+        self.name = name
+        self.client = client
+        info = client.info(name)
+        self.version = info["version"]
+        self.config = SimpleNamespace(
+            num_labels=info["num_labels"],
+            id2label={int(k): v for k, v in info["id2label"].items()},
+        )
+        self.device = torch.device("cpu")
+
+    def eval(self):
+        return self
+
+    def to(self, device):
+        return self
+
+    def __call__(self, input_ids, attention_mask=None, **kwargs):
+        import torch
+        ids = input_ids.cpu().numpy()
+        if attention_mask is not None:
+            # Right padding: only the unpadded prefix of each row goes over the wire
+            lengths = attention_mask.cpu().numpy().sum(axis=1)
+            rows = [ids[i, :lengths[i]] for i in range(len(ids))]
+        else:
+            rows = list(ids)
+        logits = self.client.classify(self.name, rows)
+        return SimpleNamespace(logits=torch.from_numpy(logits.copy()))
+
+
+def remote_model_version(name: str) -> str:
+    """Version tag of the model the inference server is running"""
+    return inference_client.info(name)["version"]
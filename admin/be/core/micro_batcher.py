@@ -0,0 +1,193 @@
+"""
+Asyncio micro-batcher for the sentiment model
+
+Concurrent /sentiment and /word-analysis requests submit their texts here
+instead of running their own forward passes. The batcher waits up to
+MICRO_BATCH_MAX_WAIT_MS (or until MICRO_BATCH_MAX_SIZE texts are queued),
+classifies everything in one batched call on the inference executor and
+resolves each caller's future with its own slice of the results.
+"""
+import asyncio
+import bisect
+import time
+from typing import Callable, List, Optional
+from core.config import settings
+from core.executor import inference_executor
+
+HISTOGRAM_BOUNDS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+
+
+class _Histogram:
+    """Counts per upper bound (last bucket is +inf)"""
+
+    def __init__(self, bounds: List[int]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+
+    def as_dict(self) -> dict:
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return dict(zip(labels, self.counts))
+
+
+class MicroBatcher:
+    """
+    Collects (texts, options) submissions from concurrent requests and runs
+    `fn(texts, options) -> results` once per flush for each distinct options value
+    """
+
+    def __init__(self, fn: Callable[[List[str], Optional[str]], list],
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending = []  # (texts, options, future, submitted_at)
+        self._pending_texts = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self.errors = 0
+        self.total_wait_seconds = 0.0
+        self.batch_texts = _Histogram(HISTOGRAM_BOUNDS)
+        self.batch_requests = _Histogram(HISTOGRAM_BOUNDS)
+
+    async def submit(self, texts: List[str], options: Optional[str] = None) -> list:
+        """Queue texts for the next batch and wait for their results (same order)"""
+        texts = list(texts)
+        if not texts:
+            return []
+        self._ensure_running()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((texts, options, future, time.perf_counter()))
+        self._pending_texts += len(texts)
+        self._wakeup.set()
+        return await future
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            # Linger so concurrent requests can join this batch
+            deadline = loop.time() + self.max_wait
+            while self._pending_texts < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = self._take_batch()
+            if not self._pending:
+                self._wakeup.clear()
+            if batch:
+                # One flush at a time: requests arriving meanwhile form the next batch
+                await self._flush(batch)
+
+    def _take_batch(self):
+        batch = []
+        count = 0
+        # Always take at least one submission, even if it alone exceeds max_batch_size
+        while self._pending and (not batch or count + len(self._pending[0][0]) <= self.max_batch_size):
+            item = self._pending.pop(0)
+            batch.append(item)
+            count += len(item[0])
+        self._pending_texts -= count
+        return batch
+
+    async def _flush(self, batch):
+        started = time.perf_counter()
+        live = [item for item in batch if not item[2].done()]  # skip cancelled callers
+        if not live:
+            return
+        try:
+            results = await inference_executor.run(self._process, [(texts, options) for texts, options, _, _ in live])
+        except Exception as e:
+            self.errors += 1
+            for _, _, future, _ in live:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        count = 0
+        for (texts, _, future, submitted_at), result in zip(live, results):
+            count += len(texts)
+            self.total_wait_seconds += started - submitted_at
+            if not future.done():
+                future.set_result(result)
+        self.batches += 1
+        self.requests += len(live)
+        self.texts += count
+        self.batch_texts.observe(count)
+        self.batch_requests.observe(len(live))
+
+    def _process(self, submissions):
+        """Runs on the executor: one fn call per options group, split back per submission"""
+        groups = {}
+        for index, (texts, options) in enumerate(submissions):
+            groups.setdefault(options, []).append(index)
+
+        results = [None] * len(submissions)
+        for options, indices in groups.items():
+            merged = [text for index in indices for text in submissions[index][0]]
+            output = self.fn(merged, options)
+            offset = 0
+            for index in indices:
+                size = len(submissions[index][0])
+                results[index] = output[offset:offset + size]
+                offset += size
+        return results
+
+    def status(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": len(self._pending),
+            "queued_texts": self._pending_texts,
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "errors": self.errors,
+            "avg_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "avg_wait_ms": round(1000 * self.total_wait_seconds / self.requests, 2) if self.requests else 0.0,
+            "batch_size_histogram": self.batch_texts.as_dict(),
+            "requests_per_batch_histogram": self.batch_requests.as_dict(),
+        }
+
+
+def _predict_sentiment(texts: List[str], options: Optional[str]) -> list:
+    from core.model_registry import model_registry
+    from untils import predict_sentiment_batch
+    sentiment_classifier, _ = model_registry.get("sentiment")
+    if not sentiment_classifier:
+        raise Exception("Failed to load sentiment model")
+    # Batch size follows the options tag (see untils.sentiment_batch_size)
+    return predict_sentiment_batch(texts, sentiment_classifier, cache_options=options)
+
+
+sentiment_batcher = MicroBatcher(
+    _predict_sentiment,
+    max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+    max_wait_ms=settings.MICRO_BATCH_MAX_WAIT_MS,
+)
+
+
+async def predict_sentiment_async(texts: List[str], options: Optional[str] = None) -> list:
+    """
+    predict_sentiment_batch for async endpoints: through the micro-batcher when
+    enabled, otherwise directly on the inference executor
+    """
+    if settings.MICRO_BATCH_ENABLED:
+        return await sentiment_batcher.submit(texts, options)
+    return await inference_executor.run(_predict_sentiment, list(texts), options)
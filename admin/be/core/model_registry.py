@@ -0,0 +1,239 @@
+"""
+Process-wide model registry
+
+Each ML model (sentiment, summary, topic) is loaded once per process and
+shared by every admin endpoint through a named handle.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from core.config import settings
+
+
+def _load_sentiment():
+    from untils import load_sentiment_model
+    return load_sentiment_model(settings.SENTIMENT_MODEL_PATH, settings.PHOBERT_TOKENIZER)
+
+
+def _load_summary():
+    from api.admin.models import load_summary_model
+    return load_summary_model()
+
+
+def _load_topic():
+    from api.admin.models import _load_topic_model
+    return _load_topic_model()
+
+
+def _warmup_topic(handle):
+    from api.admin.models import warmup_topic_model
+    warmup_topic_model(*handle)
+
+
+# Bump when preprocessing changes what the sentiment model sees, so stored
+# predictions computed from the old input are recomputed
+SENTIMENT_PREPROCESS_VERSION = "sw2"
+
+
+def _path_version(path: str) -> str:
+    """Version tag from the model directory name and its newest file mtime"""
+    try:
+        mtime = max(os.path.getmtime(os.path.join(path, f)) for f in os.listdir(path))
+    except (OSError, ValueError):
+        mtime = 0
+    return f"{os.path.basename(os.path.normpath(path))}@{int(mtime)}"
+
+
+def _model_version(name: str, path: str) -> str:
+    """
+    Path version plus the backend/weight format, so predictions from fp32,
+    int8 and ONNX Runtime models aren't mixed (remote: the server's own tag)
+    """
+    if settings.INFERENCE_BACKEND == "onnx":
+        from core.onnx_backend import onnx_model_dir
+        return f"{_path_version(onnx_model_dir(name))}+onnx"
+    if settings.INFERENCE_BACKEND == "remote":
+        from core.inference_rpc import remote_model_version
+        return remote_model_version(name)
+    version = _path_version(path)
+    return f"{version}+int8" if settings.MODEL_QUANTIZE_INT8 else version
+
+
+def _is_empty(handle) -> bool:
+    """Loaders in this project return None (or a tuple of None) on failure"""
+    if handle is None:
+        return True
+    if isinstance(handle, tuple):
+        return len(handle) == 0 or handle[0] is None
+    return False
+
+
+class ModelRegistry:
+    """Loads models lazily, once, and hands out shared handles by name"""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._warmups: Dict[str, Optional[Callable[[Any], None]]] = {}
+        self._models: Dict[str, Any] = {}
+        self._info: Dict[str, Dict[str, Any]] = {}
+        self._version_fns: Dict[str, Callable[[], str]] = {}
+        self._versions: Dict[str, str] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._loading = set()
+        self._lock = threading.RLock()
+
+    def register(self, name: str, loader: Callable[[], Any],
+                 warmup: Optional[Callable[[Any], None]] = None,
+                 version: Optional[Callable[[], str]] = None):
+        """Register (or replace) the loader, optional warm-up and version tag for a model name"""
+        with self._lock:
+            self._loaders[name] = loader
+            self._warmups[name] = warmup
+            self._version_fns[name] = version or (lambda: name)
+            self._versions.pop(name, None)
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str):
+        """Return the shared handle for a model, loading it on first use"""
+        if name in self._models:
+            return self._models[name]
+
+        # One lock per model so loading the topic model doesn't block
+        # requests that only need the (already loaded) sentiment model
+        with self._model_lock(name):
+            if name not in self._models:
+                self._load(name)
+            return self._models[name]
+
+    def set(self, name: str, handle):
+        """Install an already-loaded handle (e.g. loaded by server.py)"""
+        with self._model_lock(name):
+            self._models[name] = handle
+
+    def reload(self, name: str):
+        """Drop the cached handle and load the model again"""
+        with self._model_lock(name):
+            self._models.pop(name, None)
+            self._versions.pop(name, None)
+            return self._load(name)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models and not _is_empty(self._models[name])
+
+    def state(self, name: str) -> str:
+        """not_loaded | loading | loaded | failed"""
+        if name in self._loading:
+            return "loading"
+        if name not in self._models:
+            return "not_loaded"
+        return "failed" if _is_empty(self._models[name]) else "loaded"
+
+    def load_in_background(self, names: List[str]) -> threading.Thread:
+        """Load models one after another on a daemon thread, so the app can serve meanwhile"""
+        def run():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"⚠ Background load of model '{name}' failed: {e}")
+
+        thread = threading.Thread(target=run, name="model-loader", daemon=True)
+        thread.start()
+        return thread
+
+    def names(self) -> List[str]:
+        return list(self._loaders.keys())
+
+    def version(self, name: str) -> str:
+        """
+        Version tag stored next to persisted predictions; a new tag marks
+        them stale. Does not require the model to be loaded.
+        """
+        if name not in self._versions:
+            self._versions[name] = self._version_fns[name]()
+        return self._versions[name]
+
+    def info(self, name: str) -> Dict[str, Any]:
+        """Load state and timings for a model"""
+        return {
+            "name": name,
+            "state": self.state(name),
+            "loaded": self.is_loaded(name),
+            "version": self.version(name),
+            **self._info.get(name, {}),
+        }
+
+    def warm_up(self, name: str):
+        """Run the model's warm-up now (e.g. in a forked worker when MODEL_WARMUP is off)"""
+        if self.is_loaded(name):
+            seconds = self._warm_up(name, self._models[name])
+            if seconds is not None:
+                self._info.setdefault(name, {})["warmup_seconds"] = round(seconds, 3)
+
+    def _warm_up(self, name: str, handle) -> Optional[float]:
+        warmup = self._warmups.get(name)
+        if warmup is None or _is_empty(handle):
+            return None
+        started = time.perf_counter()
+        try:
+            warmup(handle)
+            return time.perf_counter() - started
+        except Exception as e:
+            print(f"⚠ Warm-up failed for model '{name}': {e}")
+            return None
+
+    def _model_lock(self, name: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def _load(self, name: str):
+        loader = self._loaders.get(name)
+        if loader is None:
+            raise KeyError(f"Unknown model: {name}")
+
+        from core.torch_threads import apply_torch_threads
+        apply_torch_threads()
+
+        print(f"Loading model '{name}'...")
+        self._loading.add(name)
+        started = time.perf_counter()
+        try:
+            handle = loader()
+        except Exception:
+            self._loading.discard(name)
+            raise
+        load_seconds = time.perf_counter() - started
+
+        warmup_seconds = self._warm_up(name, handle) if settings.MODEL_WARMUP else None
+
+        # Failed loads are cached too so requests don't retry on every call;
+        # use reload() once the model files are fixed
+        self._models[name] = handle
+        self._loading.discard(name)
+        self._info[name] = {
+            "load_seconds": round(load_seconds, 3),
+            "warmup_seconds": round(warmup_seconds, 3) if warmup_seconds is not None else None,
+            "loaded_at": time.time(),
+        }
+        if _is_empty(handle):
+            print(f"⚠ Model '{name}' failed to load")
+        else:
+            print(f"✓ Model '{name}' loaded in {load_seconds:.2f}s")
+        return handle
+
+
+def _sentiment_version() -> str:
+    """Model version plus the text preprocessing tag (the remote server's tag already has it)"""
+    version = _model_version("sentiment", settings.SENTIMENT_MODEL_PATH)
+    if settings.INFERENCE_BACKEND == "remote":
+        return version
+    return f"{version}+{SENTIMENT_PREPROCESS_VERSION}"
+
+
+model_registry = ModelRegistry()
+model_registry.register("sentiment", _load_sentiment, version=_sentiment_version)
+model_registry.register("summary", _load_summary,
+                        version=lambda: _model_version("summary", settings.SUMMARY_MODEL_PATH))
+model_registry.register("topic", _load_topic, warmup=_warmup_topic,
+                        version=lambda: _model_version("topic", settings.TOPIC_MODEL_PATH))
@@ -0,0 +1,70 @@
+"""
+ONNX Runtime inference backend (Settings.INFERENCE_BACKEND = "onnx")
+
+Models exported by export_onnx.py are wrapped so they look like the
+transformers models the rest of the code already uses: `model(**batch).logits`,
+`model.config` and `model.device`. onnxruntime is optional and only imported
+when this backend is selected.
+"""
+import os
+from types import SimpleNamespace
+import numpy as np
+import torch
+from core.config import settings
+
+ONNX_FILE = "model.onnx"
+
+
+def onnx_model_dir(name: str) -> str:
+    """Export directory for a registry model name (sentiment, topic, summary)"""
+    return os.path.join(settings.ONNX_MODEL_DIR, name)
+
+
+class OnnxSequenceClassifier:
+    """Drop-in for AutoModelForSequenceClassification backed by an ONNX Runtime session"""
+
+    def __init__(self, model_dir: str):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError("INFERENCE_BACKEND=onnx requires the onnxruntime package") from e
+        from transformers import AutoConfig
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        from core.torch_threads import torch_thread_count
+        options.intra_op_num_threads = settings.ONNX_INTRA_OP_THREADS or torch_thread_count()
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, ONNX_FILE), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.config = AutoConfig.from_pretrained(model_dir)
+        self.device = torch.device("cpu")
+
+    def eval(self):
+        return self
+
+    def to(self, device):
+        return self
+
+    def __call__(self, **inputs):
+        input_ids = inputs["input_ids"].cpu().numpy().astype(np.int64)
+        feed = {}
+        for name in self.input_names:
+            if name in inputs:
+                feed[name] = inputs[name].cpu().numpy().astype(np.int64)
+            else:
+                # e.g. token_type_ids in graphs exported with every tokenizer output;
+                # batches from tokenizer.pad() only carry input_ids/attention_mask
+                feed[name] = np.zeros_like(input_ids)
+        logits = self.session.run(["logits"], feed)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+def load_onnx_classifier(name: str) -> OnnxSequenceClassifier:
+    model_dir = onnx_model_dir(name)
+    if not os.path.exists(os.path.join(model_dir, ONNX_FILE)):
+        raise FileNotFoundError(f"{model_dir}/{ONNX_FILE} not found, run: python export_onnx.py {name}")
+    model = OnnxSequenceClassifier(model_dir)
+    print(f"✓ ONNX Runtime model '{name}' loaded from {model_dir}")
+    return model
@@ -0,0 +1,65 @@
+"""
+Pre-fork model sharing for multi-worker deployments (see gunicorn.conf.py)
+
+The master loads every model once. Before forking, the weights are moved to
+shared memory and the Python heap is frozen, so workers map the same pages
+instead of each holding (or copy-on-write duplicating) three BERT models.
+"""
+import gc
+from core.model_registry import model_registry
+
+
+def _torch_modules(handle):
+    """nn.Module objects inside a registry handle (pipeline, tuple or bare model)"""
+    import torch
+    items = handle if isinstance(handle, tuple) else (handle,)
+    for item in items:
+        if isinstance(item, torch.nn.Module):
+            yield item
+        elif isinstance(getattr(item, "model", None), torch.nn.Module):
+            yield item.model
+
+
+def share_loaded_models() -> int:
+    """
+    Move the weights of every loaded model into shared memory (torch
+    share_memory) and put them in eval/no-grad mode. Returns shared bytes.
+    """
+    shared = 0
+    for name in model_registry.names():
+        if not model_registry.is_loaded(name):
+            continue
+        for module in _torch_modules(model_registry.get(name)):
+            module.eval()
+            module.requires_grad_(False)
+            module.share_memory()
+            shared += sum(t.numel() * t.element_size() for t in module.state_dict().values()
+                          if hasattr(t, "numel"))
+    return shared
+
+
+def freeze_for_fork():
+    """
+    Call in the master right before forking: share model weights, then move
+    all live objects to gc's permanent generation so collections in the
+    workers don't touch (and copy) the master's pages.
+    """
+    shared = share_loaded_models()
+    gc.collect()
+    gc.freeze()
+    print(f"✓ Pre-fork: {shared / (1024 * 1024):.0f} MB of model weights in shared memory, "
+          f"{gc.get_freeze_count()} objects frozen")
+
+
+def after_fork_in_worker(worker_index: int = None, workers: int = None):
+    """
+    Per-worker setup: fresh DB connections, own thread/core share, then warm up the shared models.
+    workers: how many workers the server runs (gunicorn's cfg.workers)
+    """
+    from core.database import engine
+    from core.torch_threads import apply_torch_threads
+    # Connections opened by the master must not be used by several processes
+    engine.dispose(close=False)
+    apply_torch_threads(worker_index=worker_index, force=True, workers=workers)
+    for name in model_registry.names():
+        model_registry.warm_up(name)
@@ -0,0 +1,97 @@
+"""
+Cache of generated school summary reports (/school-summary-2)
+
+Keys are (date range, category, model versions, watermark of the posts in
+range). The watermark (max PostID, approved count, latest prediction update,
+total upvotes, which rank the examples) is one aggregate query, so a report is
+only rebuilt when posts it covers have changed. Client post
+create/update/status/delete and votes also invalidate the cache directly; in
+multi-worker deployments the watermark catches changes made through other
+processes.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Hashable, Optional, Tuple
+from core.config import settings
+
+
+class SummaryCache:
+    """Thread-safe LRU of report texts with build time and an invalidation counter"""
+
+    def __init__(self, max_entries: int = 32, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple, Tuple[str, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.last_invalidated = None
+        self.last_invalidation_reason = None
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[str]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple[Hashable, ...], report: str, build_seconds: float = 0.0):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (report, time.time(), build_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, reason: str = ""):
+        """Drop every cached report (a post changed)"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+            self.last_invalidated = time.time()
+            self.last_invalidation_reason = reason
+
+    def age(self, key: Tuple[Hashable, ...]) -> Optional[float]:
+        """Seconds since the report for key was built, None if not cached"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return time.time() - entry[1] if entry else None
+
+    def status(self) -> dict:
+        now = time.time()
+        with self._lock:
+            entries = [
+                {
+                    "key": [str(part) for part in key],
+                    "built_at": datetime.fromtimestamp(built_at, timezone.utc).isoformat(),
+                    "age_seconds": round(now - built_at, 1),
+                    "build_seconds": round(build_seconds, 3),
+                }
+                for key, (_, built_at, build_seconds) in self._entries.items()
+            ]
+            return {
+                "enabled": self.enabled,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "seconds_since_invalidation": round(now - self.last_invalidated, 1)
+                if self.last_invalidated else None,
+                "last_invalidation_reason": self.last_invalidation_reason,
+            }
+
+
+summary_cache = SummaryCache(
+    max_entries=settings.SUMMARY_CACHE_MAX_ENTRIES,
+    enabled=settings.SUMMARY_CACHE_ENABLED,
+)
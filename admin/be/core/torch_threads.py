@@ -0,0 +1,81 @@
+"""
+Per-process torch threading policy
+
+Every worker process running models gets intra-op threads = its share of the
+cores (TORCH_NUM_THREADS, or cores / WEB_CONCURRENCY when 0), a fixed
+inter-op pool, and optionally CPU affinity to its own slice of cores, so N
+workers don't oversubscribe the CPU. Applied by the model registry before
+the first model load, and again per worker after a pre-fork.
+"""
+import os
+from typing import List, Optional
+from core.config import settings
+
+_applied = False
+
+
+def available_cpus() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def torch_thread_count(workers: Optional[int] = None) -> int:
+    """Intra-op threads for this process (workers defaults to WEB_CONCURRENCY)"""
+    if settings.TORCH_NUM_THREADS > 0:
+        return settings.TORCH_NUM_THREADS
+    return max(1, len(available_cpus()) // max(1, workers or settings.WEB_CONCURRENCY))
+
+
+def pin_to_worker_cores(worker_index: int, workers: Optional[int] = None) -> Optional[List[int]]:
+    """Restrict this process to its slice of the cores (Linux only)"""
+    if not hasattr(os, "sched_setaffinity"):
+        return None
+    cpus = available_cpus()
+    workers = max(1, workers or settings.WEB_CONCURRENCY)
+    per_worker = max(1, len(cpus) // workers)
+    start = (worker_index % workers) * per_worker
+    allotted = cpus[start:start + per_worker] or cpus
+    os.sched_setaffinity(0, allotted)
+    return allotted
+
+
+def apply_torch_threads(worker_index: Optional[int] = None, force: bool = False,
+                        workers: Optional[int] = None):
+    """
+    Apply the threading policy once per process (force=True re-applies intra-op
+    threads and affinity, e.g. after fork).
+    worker_index: pin to that worker's cores when TORCH_CPU_AFFINITY is on
+    (defaults to the WORKER_INDEX environment variable).
+    workers: number of worker processes sharing the machine; the pre-fork
+    hooks pass gunicorn's actual count (defaults to WEB_CONCURRENCY).
+    """
+    global _applied
+    if _applied and not force:
+        return
+    reapply = _applied
+    _applied = True
+    import torch
+
+    if worker_index is None and os.environ.get("WORKER_INDEX", "").isdigit():
+        worker_index = int(os.environ["WORKER_INDEX"])
+    allotted = None
+    if settings.TORCH_CPU_AFFINITY and worker_index is not None:
+        allotted = pin_to_worker_cores(worker_index, workers)
+
+    threads = torch_thread_count(workers)
+    if allotted:
+        threads = min(threads, len(allotted))
+    torch.set_num_threads(threads)
+
+    # The inter-op pool can only be sized once per process; a forked worker
+    # inherits the master's setting, so re-applying leaves it alone
+    if settings.TORCH_INTEROP_THREADS > 0 and not reapply:
+        try:
+            torch.set_num_interop_threads(settings.TORCH_INTEROP_THREADS)
+        except RuntimeError as e:
+            # Only settable before the first inter-op parallel work in the process
+            print(f"⚠ Could not set inter-op threads: {e}")
+
+    print(f"✓ torch threads: intra-op={torch.get_num_threads()}, inter-op={torch.get_num_interop_threads()}"
+          + (f", pinned to CPUs {allotted}" if allotted else ""))
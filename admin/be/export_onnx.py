@@ -0,0 +1,94 @@
+"""
+Export the admin classifiers to ONNX for INFERENCE_BACKEND=onnx
+Run this with: python export_onnx.py [sentiment topic summary] [--opset 14] [--check]
+
+Writes <ONNX_MODEL_DIR>/<name>/model.onnx plus the model config, loaded
+by core/onnx_backend.py.
+"""
+import argparse
+import os
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")  # export on CPU
+
+import numpy as np
+import torch
+from core.config import settings
+from core.onnx_backend import ONNX_FILE, onnx_model_dir
+
+MODEL_NAMES = ["sentiment", "topic", "summary"]
+
+
+def load_torch_model(name):
+    """fp32 eager model + tokenizer, loaded the same way the API loads it"""
+    if name == "sentiment":
+        from untils import load_sentiment_model
+        classifier, tokenizer = load_sentiment_model(settings.SENTIMENT_MODEL_PATH, settings.PHOBERT_TOKENIZER)
+        return classifier.model, tokenizer
+    if name == "topic":
+        from api.admin.models import _load_topic_model
+        model, tokenizer, _ = _load_topic_model()
+        return model, tokenizer
+    from api.admin.models import load_summary_model
+    return load_summary_model()
+
+
+def export(name, opset, check):
+    model, tokenizer = load_torch_model(name)
+    if model is None:
+        print(f"✗ Skipping {name}: model failed to load")
+        return False
+    model = model.to("cpu").eval()
+
+    texts = ["Trường mình rất đẹp", "Phòng học hôm nay không có điện"]
+    encoded = tokenizer(texts, padding=True, return_tensors="pt")
+    # Only the inputs run_classifier_batches feeds (tokenizer.pad gives no token_type_ids)
+    input_names = ["input_ids", "attention_mask"]
+    sample = {key: encoded[key] for key in input_names}
+    output_dir = onnx_model_dir(name)
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, ONNX_FILE)
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample,),
+            path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes={**{key: {0: "batch", 1: "sequence"} for key in input_names},
+                          "logits": {0: "batch"}},
+            opset_version=opset,
+        )
+    model.config.save_pretrained(output_dir)
+    print(f"✓ Exported {name} to {path} ({os.path.getsize(path) / (1024 * 1024):.0f} MB)")
+
+    if check:
+        # Same batching path the API uses, so missing/extra graph inputs show up here
+        from core.onnx_backend import OnnxSequenceClassifier
+        from untils import run_classifier_batches
+        onnx_model = OnnxSequenceClassifier(output_dir)
+        expected = run_classifier_batches(texts, model, tokenizer)
+        actual = run_classifier_batches(texts, onnx_model, tokenizer)
+        print(f"  max |probability diff| vs PyTorch: {np.abs(expected - actual).max():.2e}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("models", nargs="*", help=f"any of {', '.join(MODEL_NAMES)} (default: all)")
+    parser.add_argument("--opset", type=int, default=14)
+    parser.add_argument("--check", action="store_true", help="compare ONNX Runtime and PyTorch outputs through run_classifier_batches")
+    args = parser.parse_args()
+    unknown = set(args.models) - set(MODEL_NAMES)
+    if unknown:
+        parser.error(f"unknown model(s): {', '.join(sorted(unknown))}")
+
+    # Export from the fp32 eager weights
+    settings.INFERENCE_BACKEND = "torch"
+    settings.MODEL_QUANTIZE_INT8 = False
+
+    for name in args.models or MODEL_NAMES:
+        export(name, args.opset, args.check)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Gunicorn config: several uvicorn workers sharing one copy of the ML models
+Run with: gunicorn -c gunicorn.conf.py server:app
+
+The app (and every model in MODEL_PRELOAD) is loaded once in the master,
+weights are moved to shared memory and the heap is frozen before forking.
+See README_DEPLOYMENT.md for the RSS measurements.
+"""
+import multiprocessing
+import os
+
+# Models must be in memory before fork: no background loader threads (they
+# don't survive fork) and no forward pass in the master (OpenMP thread pools
+# started before fork can hang the workers), so warm-up runs per worker.
+os.environ["MODEL_LOADING"] = "eager"
+os.environ["MODEL_WARMUP"] = "false"
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", min(4, multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 120
+
+
+def pre_fork(server, worker):
+    from core.prefork import freeze_for_fork
+    # Runs before every fork; sharing/freezing only has to happen once
+    if not getattr(server, "_models_frozen", False):
+        freeze_for_fork()
+        server._models_frozen = True
+    # Lowest slot not held by a live worker, so a replacement worker takes over
+    # the dead worker's slice of cores (server.WORKERS only holds live workers here)
+    used = {getattr(live, "worker_index", None) for live in server.WORKERS.values()}
+    worker.worker_index = next(index for index in range(len(used) + 1) if index not in used)
+
+
+def post_fork(server, worker):
+    from core.prefork import after_fork_in_worker
+    # server.cfg.workers is the count actually running (includes a --workers override)
+    after_fork_in_worker(worker_index=worker.worker_index, workers=server.cfg.workers)
@@ -0,0 +1,111 @@
+"""
+Standalone inference server: owns the sentiment/topic/summary models and
+serves batched forward passes over a Unix socket (see core/inference_rpc.py)
+Run this with: python inference_server.py [--socket /tmp/admin-inference.sock]
+
+API processes started with INFERENCE_BACKEND=remote then hold only
+tokenizers, so they can be scaled and restarted without reloading weights.
+"""
+import argparse
+import os
+import socketserver
+import numpy as np
+import torch
+from core.config import settings
+from core.inference_rpc import (OP_CLASSIFY, OP_INFO, decode_request, encode_error,
+                                encode_json, encode_logits, recv_frame, send_frame)
+
+# The server itself runs the models in-process (torch or onnx), never "remote"
+settings.INFERENCE_BACKEND = settings.INFERENCE_SERVER_BACKEND
+
+from core.executor import inference_executor
+from core.model_registry import model_registry
+
+
+def get_model(name: str):
+    """The nn.Module-like model inside a registry handle"""
+    handle = model_registry.get(name)
+    model = handle[0]
+    if model is None:
+        raise RuntimeError(f"Model '{name}' failed to load")
+    # The sentiment handle holds a pipeline (or TextClassifier) wrapping the model
+    return model.model if hasattr(model, "tokenizer") else model
+
+
+def classify(name: str, rows):
+    model = get_model(name)
+    pad_id = model.config.pad_token_id if model.config.pad_token_id is not None else 1
+    longest = max(len(row) for row in rows)
+    input_ids = np.full((len(rows), longest), pad_id, dtype=np.int64)
+    attention_mask = np.zeros((len(rows), longest), dtype=np.int64)
+    for i, row in enumerate(rows):
+        input_ids[i, :len(row)] = row
+        attention_mask[i, :len(row)] = 1
+
+    device = getattr(model, "device", torch.device("cpu"))
+    with inference_executor.slot(), torch.no_grad():
+        logits = model(input_ids=torch.from_numpy(input_ids).to(device),
+                       attention_mask=torch.from_numpy(attention_mask).to(device)).logits
+    return logits.float().cpu().numpy()
+
+
+def info(name: str) -> dict:
+    config = get_model(name).config
+    return {
+        "num_labels": config.num_labels,
+        "id2label": {str(k): v for k, v in config.id2label.items()},
+        "version": model_registry.version(name),
+    }
+
+
+class InferenceHandler(socketserver.BaseRequestHandler):
+    """One thread per API connection; a connection sends any number of requests"""
+
+    def handle(self):
+        while True:
+            try:
+                payload = recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+            try:
+                op, name, rows = decode_request(payload)
+                if op == OP_INFO:
+                    response = encode_json(info(name))
+                elif op == OP_CLASSIFY:
+                    response = encode_logits(classify(name, rows) if rows else np.zeros((0, 0), np.float32))
+                else:
+                    response = encode_error(f"unknown op {op}")
+            except Exception as e:
+                print(f"Error in inference request: {e}")
+                response = encode_error(str(e))
+            send_frame(self.request, response)
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--socket", default=settings.INFERENCE_SOCKET_PATH)
+    parser.add_argument("--models", nargs="+", default=settings.MODEL_PRELOAD)
+    args = parser.parse_args()
+
+    for name in args.models:
+        model_registry.get(name)
+
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+    with InferenceServer(args.socket, InferenceHandler) as server:
+        os.chmod(args.socket, 0o660)
+        print(f"🚀 Inference server ({settings.INFERENCE_BACKEND}) listening on {args.socket}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@
 # Export database models
 from models.database import (
     User, Role, Permission, UserRole, RolePermission,
-    Post, Vote, Report, Comment, CodeType, Code,
+    Post, PostPrediction, SentimentDailyRollup, Vote, Report, Comment, CodeType, Code,
     PostStatus, UserStatus, VoteType, ReportStatus
 )
 
@@ -36,7 +36,7 @@ from models.schemas import (
 __all__ = [
     # Database models
     "User", "Role", "Permission", "UserRole", "RolePermission",
-    "Post", "Vote", "Report", "Comment", "CodeType", "Code",
+    "Post", "PostPrediction", "SentimentDailyRollup", "Vote", "Report", "Comment", "CodeType", "Code",
     "PostStatus", "UserStatus", "VoteType", "ReportStatus",
     # User schemas
     "UserBase", "UserCreate", "UserUpdate", "UserResponse", "UserListResponse",
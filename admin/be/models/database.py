@@ -1,7 +1,7 @@
 """
 Database models using SQLAlchemy
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Enum, BigInteger, TIMESTAMP, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Enum, BigInteger, TIMESTAMP, UniqueConstraint, Float, Date
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -207,11 +207,54 @@ class Post(Base):
     votes = relationship("Vote", back_populates="post", cascade="all, delete-orphan")
     reports = relationship("Report", back_populates="post", cascade="all, delete-orphan")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
+    prediction = relationship("PostPrediction", back_populates="post", uselist=False, cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Post(PostID={self.PostID}, Title={self.Title[:30]}...)>"
 
 
+# ========== PostPredictions Table ==========
+class PostPrediction(Base):
+    """Stored sentiment/topic inference results for a post (admin analytics)"""
+    __tablename__ = "post_predictions"
+
+    PostID = Column(Integer, ForeignKey("posts.PostID"), primary_key=True)
+    ContentHash = Column(String(64), nullable=False)  # sha1 of Title + Content
+    SentimentLabel = Column(String(20), nullable=True)  # Positive / Negative / Neutral
+    SentimentScore = Column(Float, nullable=True)
+    SentimentModelVersion = Column(String(255), nullable=True)
+    TopicLabel = Column(String(20), nullable=True)  # LABEL_0..LABEL_3
+    TopicConfidence = Column(Float, nullable=True)
+    TopicProbabilities = Column(Text, nullable=True)  # JSON list
+    TopicModelVersion = Column(String(255), nullable=True)
+    # What this post currently contributes to sentiment_daily_rollup (None = nothing)
+    RollupDay = Column(Date, nullable=True)
+    RollupCategory = Column(String(100), nullable=True)
+    RollupSentiment = Column(String(20), nullable=True)
+    UpdatedOn = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    post = relationship("Post", back_populates="prediction")
+
+    def __repr__(self):
+        return f"<PostPrediction(PostID={self.PostID}, Sentiment={self.SentimentLabel}, Topic={self.TopicLabel})>"
+
+
+# ========== SentimentDailyRollup Table ==========
+class SentimentDailyRollup(Base):
+    """Per-day, per-category sentiment counts of approved posts (for /sentiment-trend)"""
+    __tablename__ = "sentiment_daily_rollup"
+
+    Day = Column(Date, primary_key=True)
+    Category = Column(String(100), primary_key=True, default="")
+    Positive = Column(Integer, default=0, nullable=False)
+    Negative = Column(Integer, default=0, nullable=False)
+    Neutral = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<SentimentDailyRollup(Day={self.Day}, Category={self.Category})>"
+
+
 # ========== Votes Table ==========
 class Vote(Base):
     """Vote model"""
@@ -5,8 +5,8 @@ Combines Admin APIs (NLP/ML) and Client APIs (CRUD)
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-from untils import load_sentiment_model, load_stopwords, device
+from core.config import settings
+from core.model_registry import model_registry
 
 # Import admin and client API routers
 try:
@@ -61,43 +61,44 @@ app.add_middleware(
 )
 
 # Load ML Models for Admin API
-print("Loading ML models for Admin API...")
-
-# Load Sentiment Model
-print("Loading sentiment model for summarization...")
-sentiment_model_path = "fine_tuned_model"
-SENTIMENT_CLASSIFIER_SUMMARY, SENTIMENT_TOKENIZER_SUMMARY = load_sentiment_model(sentiment_model_path)
-
-# Load Summarization Model
-print("Loading summarization model...")
-try:
-    summary_tokenizer_global = AutoTokenizer.from_pretrained("./summary_model_final")
-    summary_model_global = AutoModelForSequenceClassification.from_pretrained("./summary_model_final")
-    summary_model_global.to(device)
-    summary_model_global.eval()
-    print(f"Summarization model loaded on: {device}")
-except Exception as e:
-    print(f"Error loading summarization model: {e}")
-    summary_model_global = None
-    summary_tokenizer_global = None
-
-# Load stopwords
-stopwords_path_global = "data/vietnamese-stopwords.txt"
-stopwords_global = load_stopwords(stopwords_path_global)
-
-# Set global models for admin helpers
+if settings.MODEL_LOADING == "eager":
+    print("Loading ML models for Admin API...")
+    for model_name in settings.MODEL_PRELOAD:
+        model_registry.get(model_name)
+elif settings.MODEL_LOADING == "background":
+    # CRUD routes answer right away; /client/health/ready reports when models are up
+    @app.on_event("startup")
+    def load_models_in_background():
+        model_registry.load_in_background(settings.MODEL_PRELOAD)
+else:
+    print("Lazy model loading: each model loads on first use")
+
+# Set stopwords/device for admin helpers (models are shared through the registry)
 if admin_api_router:
     from api.admin.helpers import set_global_models
-    set_global_models(
-        SENTIMENT_CLASSIFIER_SUMMARY,
-        SENTIMENT_TOKENIZER_SUMMARY,
-        summary_model_global,
-        summary_tokenizer_global,
-        stopwords_global,
-        device
-    )
+    from untils import get_stopword_matcher
+    # The device is resolved when a model loads, so importing torch isn't on the startup path
+    set_global_models(stopwords=get_stopword_matcher())
     print("✓ Global models set for admin helpers")
 
+# Background worker that classifies new/edited posts for admin analytics
+if admin_api_router:
+    from utils.inference_worker import inference_worker
+    from core.executor import inference_executor
+
+    @app.on_event("startup")
+    def start_inference_worker():
+        if settings.INFERENCE_WORKER_ENABLED:
+            inference_worker.start()
+        else:
+            print("Inference worker disabled: posts are classified on the admin read paths")
+
+    @app.on_event("shutdown")
+    def stop_inference_worker():
+        if settings.INFERENCE_WORKER_ENABLED:
+            inference_worker.stop()
+        inference_executor.shutdown()
+
 # Include Admin API router (no prefix - keep original endpoints)
 if admin_api_router:
     app.include_router(admin_api_router)
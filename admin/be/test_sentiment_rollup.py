@@ -0,0 +1,71 @@
+"""
+Test script for sentiment_daily_rollup maintenance (two concurrent sessions)
+Run this with: python -m pytest test_sentiment_rollup.py  (or python test_sentiment_rollup.py)
+"""
+import os
+import tempfile
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from models.database import Base, Post, PostPrediction, SentimentDailyRollup
+from utils.sentiment_rollup import mark_prediction_stale, sync_post_rollup
+
+
+def make_sessions():
+    """Two sessions on one SQLite file, like two workers sharing app.db"""
+    path = os.path.join(tempfile.mkdtemp(), "rollup.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def rollup_counts(db):
+    return [(row.Positive, row.Negative, row.Neutral) for row in db.query(SentimentDailyRollup)]
+
+
+def test_stale_post_rescored_by_two_sessions_counts_once():
+    Session = make_sessions()
+
+    setup = Session()
+    post = Post(PostID=10, UserID=1, Title="t", Content="c", Category="a", Status="approved",
+                UpVotes=0, DownVotes=0, CreatedOn=datetime(2024, 1, 1))
+    prediction = PostPrediction(PostID=10, ContentHash="h", SentimentLabel="Positive",
+                                SentimentModelVersion="v1")
+    setup.add_all([post, prediction])
+    setup.flush()
+    sync_post_rollup(setup, post, prediction)
+    setup.commit()
+    assert rollup_counts(setup) == [(1, 0, 0)]
+
+    # Edited: out of the rollup until it is re-scored
+    post.Content = "edited"
+    mark_prediction_stale(setup, post)
+    setup.commit()
+    assert rollup_counts(setup) == [(0, 0, 0)]
+    setup.close()
+
+    # Background worker and a read-path catch-up both load the stale prediction...
+    first, second = Session(), Session()
+    loaded = []
+    for db in (first, second):
+        stale_post = db.query(Post).filter(Post.PostID == 10).one()
+        stale_prediction = db.query(PostPrediction).filter(PostPrediction.PostID == 10).one()
+        assert stale_prediction.RollupDay is None
+        stale_prediction.SentimentLabel = "Positive"
+        stale_prediction.SentimentModelVersion = "v1"
+        loaded.append((db, stale_post, stale_prediction))
+
+    # ...then re-score and commit one after the other
+    moved = []
+    for db, stale_post, stale_prediction in loaded:
+        moved.append(sync_post_rollup(db, stale_post, stale_prediction))
+        db.commit()
+
+    check = Session()
+    assert moved == [True, False]
+    assert rollup_counts(check) == [(1, 0, 0)]
+    print("✓ Concurrent re-score counted once")
+
+
+if __name__ == "__main__":
+    test_stale_post_rescored_by_two_sessions_counts_once()
@@ -1,12 +1,26 @@
-import torch
 import re
-import pandas as pd
+import threading
 import numpy as np
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 from collections import defaultdict
+from core.config import settings
+from core.executor import inference_executor
+from core.inference_cache import sentiment_cache
+from core.model_registry import model_registry
 
-# Properly configure device
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+_device = None
+
+
+def get_device():
+    """torch device for the models (cuda if available); torch is imported on first use,
+    so importing this module (and the admin routers) stays cheap"""
+    global _device
+    if _device is None:
+        import torch
+        _device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    return _device
+
+
+SENTIMENT_LABELS = {"LABEL_0": "Negative", "LABEL_1": "Neutral", "LABEL_2": "Positive"}
 
 # Hàm tiền xử lý văn bản
 def load_stopwords(file_path):
@@ -14,18 +28,121 @@ def load_stopwords(file_path):
         stopwords = [line.strip('\n') for line in ins]
     return set(stopwords)
 
+_STOPWORD_END = object()
+
+
+class StopwordMatcher:
+    """
+    Frozen syllable trie over the stopword list. Entries in the file are
+    word-segmented ("bởi_vì"), so each one is indexed both as its syllable
+    sequence ("bởi vì" in raw text) and as the joined token (tokenizer output).
+    Matching is greedy longest-match, case-insensitive, in one left-to-right scan.
+    """
+
+    def __init__(self, stopwords):
+        self._root = {}
+        self.size = 0
+        self.max_syllables = 0
+        for entry in stopwords:
+            entry = entry.strip().lower()
+            if not entry:
+                continue
+            syllables = entry.replace('_', ' ').split()
+            self._insert(syllables)
+            if len(syllables) > 1:
+                self._insert([entry])
+            self.size += 1
+            self.max_syllables = max(self.max_syllables, len(syllables))
+
+    def _insert(self, syllables):
+        node = self._root
+        for syllable in syllables:
+            node = node.setdefault(syllable, {})
+        node[_STOPWORD_END] = True
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, word):
+        node = self._root
+        for syllable in word.lower().replace('_', ' ').split():
+            node = node.get(syllable)
+            if node is None:
+                return False
+        return _STOPWORD_END in node
+
+    def filter(self, text):
+        """Remove single- and multi-syllable stopwords from whitespace-separated text"""
+        words = text.split()
+        lowered = text.lower().split()
+        if len(lowered) != len(words):
+            lowered = [word.lower() for word in words]
+        root_get = self._root.get
+        kept = []
+        append = kept.append
+        i, n = 0, len(words)
+        while i < n:
+            node = root_get(lowered[i])
+            if node is None:
+                # Fast path: most words don't start any stopword
+                append(words[i])
+                i += 1
+                continue
+            end = i + 1 if _STOPWORD_END in node else 0
+            j = i + 1
+            # Walk at most max_syllables steps; remember the longest complete stopword
+            while j < n:
+                node = node.get(lowered[j])
+                if node is None:
+                    break
+                j += 1
+                if _STOPWORD_END in node:
+                    end = j
+            if end:
+                i = end
+            else:
+                append(words[i])
+                i += 1
+        return ' '.join(kept)
+
+
+_stopword_matcher = None
+_stopword_lock = threading.Lock()
+
+
+def get_stopword_matcher(file_path=None):
+    """Shared StopwordMatcher, built from settings.STOPWORDS_PATH on first use"""
+    global _stopword_matcher
+    if _stopword_matcher is None:
+        with _stopword_lock:
+            if _stopword_matcher is None:
+                path = file_path or settings.STOPWORDS_PATH
+                _stopword_matcher = StopwordMatcher(load_stopwords(path))
+                print(f"✓ Stopword matcher built: {len(_stopword_matcher)} entries "
+                      f"(up to {_stopword_matcher.max_syllables} syllables)")
+    return _stopword_matcher
+
+
 def filter_stop_words(text, stop_words):
+    if isinstance(stop_words, StopwordMatcher):
+        return stop_words.filter(text)
     new_sent = [word for word in text.split() if word not in stop_words]
     return ' '.join(new_sent)
 
+# Compiled once at import; these run for every post on every analytics request
+_EMOJI_PATTERN = re.compile(pattern="["
+    u"\U0001F600-\U0001F64F"
+    u"\U0001F300-\U0001F5FF"
+    u"\U0001F680-\U0001F6FF"
+    u"\U0001F1E0-\U0001F1FF"
+    "]+", flags=re.UNICODE)
+# Special characters (keeping Vietnamese diacritics), digits and whitespace:
+# any run of them collapses to a single space in one pass
+_SPECIAL_DIGIT_SPACE_PATTERN = re.compile(r'(?:[^\w\s\u00C0-\u1EF9]|\d|\s)+')
+
+
 def deEmojify(text):
-    regrex_pattern = re.compile(pattern="["
-        u"\U0001F600-\U0001F64F"
-        u"\U0001F300-\U0001F5FF"
-        u"\U0001F680-\U0001F6FF"
-        u"\U0001F1E0-\U0001F1FF"
-        "]+", flags=re.UNICODE)
-    return regrex_pattern.sub(r'', text)
+    return _EMOJI_PATTERN.sub(r'', text)
 
 def remove_special_chars_and_numbers(text):
     """
@@ -33,50 +150,144 @@ def remove_special_chars_and_numbers(text):
     This function will:
     1. Remove all standalone special characters
     2. Remove numbers connected to special characters
+    Special characters, numbers and extra spaces are all replaced in a single regex pass.
+    """
+    return _SPECIAL_DIGIT_SPACE_PATTERN.sub(' ', text).strip()
+
+
+class TextNormalizer:
+    """
+    Reusable text normalization pipeline (same output as the original preprocess_text):
+    emoji removal -> special chars/numbers/whitespace (one fused pass) -> optional word
+    tokenizer -> stopword filtering -> lowercasing.
     """
-    # First replace special chars that might be legitimate in Vietnamese
-    text = re.sub(r'[^\w\s\u00C0-\u1EF9]', ' ', text)  # Keep Vietnamese diacritics
-    
-    # Remove numbers adjacent to special characters
-    text = re.sub(r'[^\w\s\u00C0-\u1EF9]*\d+[^\w\s\u00C0-\u1EF9]*', ' ', text)
-    
-    # Clean up extra spaces
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    return text
+
+    def __init__(self, remove_emoji=True, remove_special=True, lowercase=True,
+                 stopwords=None, tokenizer=None):
+        self.remove_emoji = remove_emoji
+        self.remove_special = remove_special
+        self.lowercase = lowercase
+        self.stopwords = stopwords
+        self.tokenizer = tokenizer
+
+    def normalize(self, text):
+        if self.remove_emoji:
+            text = _EMOJI_PATTERN.sub('', text)
+
+        if self.remove_special:
+            text = _SPECIAL_DIGIT_SPACE_PATTERN.sub(' ', text).strip()
+
+        if self.tokenizer:
+            sentences = self.tokenizer.tokenize(text)
+            text = " ".join([" ".join(sentence) for sentence in sentences])
+
+        if self.stopwords:
+            text = filter_stop_words(text, self.stopwords)
+
+        if self.lowercase:
+            text = text.lower()
+
+        return text
+
+    __call__ = normalize
+
+    def normalize_many(self, texts):
+        """Normalize a batch of texts"""
+        normalize = self.normalize
+        return [normalize(text) for text in texts]
+
 
 def preprocess_text(text, tokenizer=None, remove_stopwords=False, stopwords=None,
                     remove_emoji=True, lowercase=True, remove_special=True):
-    if remove_emoji:
-        text = deEmojify(text)
-    
-    if remove_special:
-        text = remove_special_chars_and_numbers(text)
-    
-    if tokenizer:
-        sentences = tokenizer.tokenize(text)
-        text = " ".join([" ".join(sentence) for sentence in sentences])
-    
-    if remove_stopwords and stopwords:
-        text = filter_stop_words(text, stopwords)
-    
-    if lowercase:
-        text = text.lower()
-    
-    return text
+    normalizer = TextNormalizer(
+        remove_emoji=remove_emoji, remove_special=remove_special, lowercase=lowercase,
+        stopwords=stopwords if remove_stopwords else None, tokenizer=tokenizer
+    )
+    return normalizer.normalize(text)
 
 # Tải mô hình
+def quantize_dynamic_int8(model):
+    """Dynamic int8 quantization of the Linear layers (weights int8, activations quantized per batch)"""
+    import torch
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def maybe_quantize(model, device, name="model"):
+    """Apply int8 quantization when settings.MODEL_QUANTIZE_INT8 is on and the model runs on CPU"""
+    if not settings.MODEL_QUANTIZE_INT8:
+        return model
+    import torch
+    if torch.device(device).type != "cpu":
+        print(f"MODEL_QUANTIZE_INT8 ignored for {name}: dynamic quantization is CPU only")
+        return model
+    model = quantize_dynamic_int8(model.eval())
+    print(f"✓ {name} quantized to int8 (Linear layers)")
+    return model
+
+
+class TextClassifier:
+    """
+    Stand-in for the transformers text-classification pipeline around a model-like
+    object (ONNX Runtime or remote): exposes .model/.tokenizer (used by
+    predict_sentiment_batch) and returns the same output when called
+    """
+
+    def __init__(self, model, tokenizer):
+        self.model = model
+        self.tokenizer = tokenizer
+
+    def __call__(self, texts, truncation=True, max_length=100, **kwargs):
+        batch = [texts] if isinstance(texts, str) else list(texts)
+        probabilities = run_classifier_batches(batch, self.model, self.tokenizer, max_length=max_length)
+        best = probabilities.argmax(axis=1)
+        return [
+            {"label": self.model.config.id2label[int(label_id)], "score": float(probabilities[i, label_id])}
+            for i, label_id in enumerate(best)
+        ]
+
+
+def load_classifier(name, model_path, tokenizer_name, device=None, use_fast=True, **model_kwargs):
+    """
+    (model, tokenizer) for a registry model name under settings.INFERENCE_BACKEND:
+    onnx/remote return model-like wrappers (see core/onnx_backend.py, core/inference_rpc.py),
+    torch loads model_path onto device, int8-quantized when MODEL_QUANTIZE_INT8. Raises on failure.
+    """
+    # Imported here so the API can start serving before transformers is loaded
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_name, use_fast=use_fast)
+    if settings.INFERENCE_BACKEND == "onnx":
+        from core.onnx_backend import load_onnx_classifier
+        return load_onnx_classifier(name), tokenizer
+    if settings.INFERENCE_BACKEND == "remote":
+        from core.inference_rpc import RemoteSequenceClassifier
+        return RemoteSequenceClassifier(name), tokenizer
+
+    device = device or get_device()
+    model = AutoModelForSequenceClassification.from_pretrained(model_path, **model_kwargs)
+    # Move model to device before quantizing / creating a pipeline
+    model = model.to(device)
+    model.eval()
+    return maybe_quantize(model, device, f"{name} model"), tokenizer
+
+
 def load_sentiment_model(model_path, tokenizer_name="vinai/phobert-base-v2"):
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    # Imported here so the API can start serving before torch/transformers are loaded
+    import torch
+    from transformers import pipeline
+
+    if settings.INFERENCE_BACKEND in ("onnx", "remote"):
+        model, tokenizer = load_classifier("sentiment", model_path, tokenizer_name, use_fast=False)
+        return TextClassifier(model, tokenizer), tokenizer
+
+    model_kwargs = {
+        "torch_dtype": torch.float32,  # Explicitly set dtype
+        "low_cpu_mem_usage": True,
+    }
+    device = get_device()
     try:
-        tokenizer = AutoTokenizer.from_pretrained(tokenizer_name, use_fast=False)
-        model = AutoModelForSequenceClassification.from_pretrained(
-            model_path,
-            torch_dtype=torch.float32,  # Explicitly set dtype
-            low_cpu_mem_usage=True
-        )
-        # Move model to device before creating pipeline
-        model = model.to(device)
+        model, tokenizer = load_classifier("sentiment", model_path, tokenizer_name, device=device,
+                                           use_fast=False, **model_kwargs)
         device_id = 0 if device.type == "cuda" else -1
         sentiment_classifier = pipeline(
             "text-classification",
@@ -90,13 +301,8 @@ def load_sentiment_model(model_path, tokenizer_name="vinai/phobert-base-v2"):
         print("Falling back to CPU")
         try:
             # Fallback with explicit CPU loading
-            tokenizer = AutoTokenizer.from_pretrained(tokenizer_name, use_fast=False)
-            model = AutoModelForSequenceClassification.from_pretrained(
-                model_path,
-                torch_dtype=torch.float32,
-                low_cpu_mem_usage=True
-            )
-            model = model.to("cpu")
+            model, tokenizer = load_classifier("sentiment", model_path, tokenizer_name, device=torch.device("cpu"),
+                                               use_fast=False, **model_kwargs)
             sentiment_classifier = pipeline(
                 "text-classification",
                 model=model,
@@ -109,6 +315,85 @@ def load_sentiment_model(model_path, tokenizer_name="vinai/phobert-base-v2"):
             raise
 
 
+# Batch inference
+def run_classifier_batches(texts, model, tokenizer, batch_size=32, max_length=100):
+    """
+    Run a sequence classifier over many texts, return softmax probabilities (N, num_labels).
+    Texts are tokenized once, sorted by token length and grouped into batches that are
+    padded only to the longest item of each batch (dynamic padding). One forward pass per batch.
+    """
+    import torch
+    num_labels = model.config.num_labels
+    probabilities = np.zeros((len(texts), num_labels), dtype=np.float32)
+    if not texts:
+        return probabilities
+
+    model_device = getattr(model, "device", None) or get_device()
+    encoded = tokenizer(list(texts), truncation=True, max_length=max_length)["input_ids"]
+    # Length bucketing: neighbours in sorted order have similar lengths, so little padding
+    order = sorted(range(len(texts)), key=lambda i: len(encoded[i]))
+
+    for start in range(0, len(order), batch_size):
+        indices = order[start:start + batch_size]
+        batch = tokenizer.pad({"input_ids": [encoded[i] for i in indices]}, padding=True, return_tensors="pt")
+        batch = {k: v.to(model_device) for k, v in batch.items()}
+        with inference_executor.slot(), torch.no_grad():
+            logits = model(**batch).logits
+        probabilities[indices] = torch.softmax(logits.float(), dim=-1).cpu().numpy()
+
+    return probabilities
+
+
+def sentiment_batch_size(cache_options=None):
+    """Texts per forward pass for a kind of input (the cache_options tag)"""
+    # Phrases are a few words long, so large batches stay cheap to pad
+    if cache_options == "phrase":
+        return settings.PHRASE_BATCH_SIZE
+    return settings.SENTIMENT_BATCH_SIZE
+
+
+def predict_sentiment_batch(texts, sentiment_classifier, batch_size=None, max_length=None, cache_options=None):
+    """
+    Classify many (already preprocessed) texts with the sentiment pipeline's model.
+    Returns one {"label": "LABEL_x", "score": float} per text, same as the pipeline output.
+    cache_options: tag describing how the texts were preprocessed; when given, results
+    are looked up in / stored to the shared sentiment LRU cache. Only pass it for the
+    registry's sentiment model, since the cache key uses that model's version.
+    It also picks the default batch size (sentiment_batch_size).
+    """
+    batch_size = batch_size or sentiment_batch_size(cache_options)
+    max_length = max_length or settings.SENTIMENT_MAX_LENGTH
+    results = [None] * len(texts)
+
+    keys = None
+    if cache_options is not None and sentiment_cache.enabled:
+        prefix = (model_registry.version("sentiment"), max_length, cache_options)
+        keys = [sentiment_cache.make_key(prefix, text) for text in texts]
+        for i, key in enumerate(keys):
+            cached = sentiment_cache.get(key)
+            if cached is not None:
+                results[i] = {"label": cached[0], "score": cached[1]}
+
+    # Identical texts within the call are classified once
+    pending = list(dict.fromkeys(texts[i] for i, result in enumerate(results) if result is None))
+    if pending:
+        model = sentiment_classifier.model
+        probabilities = run_classifier_batches(pending, model, sentiment_classifier.tokenizer,
+                                               batch_size=batch_size, max_length=max_length)
+        best = probabilities.argmax(axis=1)
+        id2label = model.config.id2label
+        computed = {
+            text: {"label": id2label[int(label_id)], "score": float(probabilities[j, label_id])}
+            for j, (text, label_id) in enumerate(zip(pending, best))
+        }
+        for i, text in enumerate(texts):
+            if results[i] is None:
+                results[i] = computed[text]
+                if keys is not None:
+                    sentiment_cache.put(keys[i], (results[i]["label"], results[i]["score"]))
+
+    return results
+
 
 # Alternative to underthesea's word_tokenize
 def simple_word_tokenize(text):
@@ -165,50 +450,81 @@ def simple_ner(text):
     
     return entities
 
-def analyze_words_sentiment_adaptive(text, sentiment_classifier, min_window=3, max_window=7):
+def classify_phrases(phrases, sentiment_classifier, cache=None):
     """
-    Analyze sentiment of individual words using an adaptive window approach
+    Classify short phrases in batched forward passes; identical phrases are scored once.
+    Phrases already in `cache` are not classified again; new results are added to it.
+    Returns the cache: {phrase: {"sentiment": "Positive"/"Negative"/"Neutral", "confidence": score}}
+    """
+    cache = {} if cache is None else cache
+    missing = [phrase for phrase in dict.fromkeys(phrases) if phrase not in cache]
+    if not missing:
+        return cache
+    try:
+        results = predict_sentiment_batch(missing, sentiment_classifier, cache_options="phrase")
+    except Exception as e:
+        print(f"⚠️ Bỏ qua {len(missing)} cụm do lỗi: {e}")
+        return cache
+    for phrase, result in zip(missing, results):
+        cache[phrase] = {"sentiment": SENTIMENT_LABELS[result["label"]], "confidence": result["score"]}
+    return cache
+
+
+def word_context_windows(text, min_window=3, max_window=7):
+    """
+    (word, context phrase) for every sentiment-bearing word, in text order.
+    Window size adapts to the word's POS tag: adjectives narrow, nouns medium, others wide.
     """
     words = simple_word_tokenize(text)
-    pos_tags = simple_pos_tag(text)
-    filtered_words_with_pos = [(word, tag) for word, tag in pos_tags if tag in ('N', 'V', 'A', 'R')]
-    filtered_words = [word for word, _ in filtered_words_with_pos]
-    word_sentiments = {}
+    word_tags = {}
+    for word, tag in simple_pos_tag(text):
+        if tag in ('N', 'V', 'A', 'R'):
+            word_tags.setdefault(word, tag)
 
+    windows = []
     for i, word in enumerate(words):
-        if word not in filtered_words:
+        word_tag = word_tags.get(word)
+        if word_tag is None:
             continue
-        word_tag = next((tag for w, tag in filtered_words_with_pos if w == word), None)
-        if word_tag and word_tag == 'A':
+        if word_tag == 'A':
             window_size = min_window
-        elif word_tag and word_tag == 'N':
+        elif word_tag == 'N':
             window_size = (min_window + max_window) // 2
         else:
             window_size = max_window
 
         start = max(0, i - window_size // 2)
         end = min(len(words), i + window_size // 2 + 1)
-        phrase = " ".join(words[start:end])
+        windows.append((word, " ".join(words[start:end])))
+    return windows
 
-        try:
-            result = sentiment_classifier(phrase)
-            label = result[0]["label"]
-            score = result[0]["score"]
-            sentiment = {"LABEL_0": "Negative", "LABEL_1": "Neutral", "LABEL_2": "Positive"}[label]
-            word_sentiments[word] = {
-                "sentiment": sentiment,
-                "confidence": score,
-                "context": phrase
-            }
-        except Exception as e:
-            print(f"⚠️ Bỏ qua cụm '{phrase}' do lỗi: {e}")
+
+def analyze_words_sentiment_adaptive(text, sentiment_classifier, min_window=3, max_window=7, phrase_cache=None):
+    """
+    Analyze sentiment of individual words using an adaptive window approach
+    All context windows are collected first and classified together in batches.
+    """
+    windows = word_context_windows(text, min_window, max_window)
+    phrase_results = classify_phrases([phrase for _, phrase in windows], sentiment_classifier, phrase_cache)
+
+    word_sentiments = {}
+    # Later occurrences of a word overwrite earlier ones, as before
+    for word, phrase in windows:
+        result = phrase_results.get(phrase)
+        if result is None:
             continue
+        word_sentiments[word] = {
+            "sentiment": result["sentiment"],
+            "confidence": result["confidence"],
+            "context": phrase
+        }
 
     return word_sentiments
 
-def analyze_phrases_sentiment(text, sentiment_classifier):
+def candidate_phrases(text):
     """
-    Analyze sentiment of meaningful phrases in the text
+    Meaningful phrases of the text (POS-pattern pairs, single content words and
+    multi-word entities), deduplicated in first-seen order
     """
     entities = simple_ner(text)
     pos_tags = simple_pos_tag(text)
@@ -241,32 +557,45 @@ def analyze_phrases_sentiment(text, sentiment_classifier):
             if len(entity_text.split()) > 1:
                 phrases.append(entity_text)
 
-    phrases = list(set(phrases))
+    return list(dict.fromkeys(phrases))
+
+
+def analyze_phrases_sentiment(text, sentiment_classifier, phrase_cache=None):
+    """
+    Analyze sentiment of meaningful phrases in the text
+    """
+    phrases = candidate_phrases(text)
+    phrase_results = classify_phrases(phrases, sentiment_classifier, phrase_cache)
+
     phrase_sentiments = {}
     for phrase in phrases:
-        try:
-            result = sentiment_classifier(phrase)
-            label = result[0]["label"]
-            score = result[0]["score"]
-            sentiment = {"LABEL_0": "Negative", "LABEL_1": "Neutral", "LABEL_2": "Positive"}[label]
-            if score > 0.7 and sentiment != "Neutral":
-                phrase_sentiments[phrase] = {
-                    "sentiment": sentiment,
-                    "confidence": score
-                }
-        except Exception as e:
-            print(f"⚠️ Bỏ qua cụm '{phrase}' do lỗi: {e}")
-            continue
+        result = phrase_results.get(phrase)
+        if result and result["confidence"] > 0.7 and result["sentiment"] != "Neutral":
+            phrase_sentiments[phrase] = {
+                "sentiment": result["sentiment"],
+                "confidence": result["confidence"]
+            }
 
     return phrase_sentiments
 
-def extract_sentiment_words(text, sentiment_classifier, threshold=0.75):
+def sentiment_phrase_pool(text):
+    """Every phrase extract_sentiment_words(text) classifies: word windows + candidate phrases"""
+    processed_text = preprocess_text(text, remove_emoji=True, lowercase=True)
+    return [phrase for _, phrase in word_context_windows(processed_text)] + candidate_phrases(processed_text)
+
+
+def extract_sentiment_words(text, sentiment_classifier, threshold=0.75, phrase_cache=None):
     """
     Extract sentiment-charged words from the text
+    phrase_cache: {phrase: {"sentiment", "confidence"}} already scored (e.g. by the micro-batcher)
     """
     processed_text = preprocess_text(text, remove_emoji=True, lowercase=True)
-    word_sentiments = analyze_words_sentiment_adaptive(processed_text, sentiment_classifier)
-    phrase_sentiments = analyze_phrases_sentiment(processed_text, sentiment_classifier)
+
+    # Words and phrases overlap heavily: score the combined candidate pool in one
+    # batched pass, then both analyses read from the shared cache
+    phrase_cache = classify_phrases(sentiment_phrase_pool(text), sentiment_classifier, cache=phrase_cache)
+    word_sentiments = analyze_words_sentiment_adaptive(processed_text, sentiment_classifier, phrase_cache=phrase_cache)
+    phrase_sentiments = analyze_phrases_sentiment(processed_text, sentiment_classifier, phrase_cache=phrase_cache)
     all_sentiment_items = {}
 
     for word, data in word_sentiments.items():
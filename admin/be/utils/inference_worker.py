@@ -0,0 +1,181 @@
+"""
+Background inference worker - classify new/edited posts off the request path
+
+Client post endpoints enqueue post IDs; a worker thread drains the queue in
+micro-batches and stores sentiment/topic predictions, so admin analytics
+read precomputed results.
+"""
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+from core.config import settings
+
+
+class InferenceWorker:
+    """In-process job queue with one worker thread, backpressure and retry"""
+
+    def __init__(self, max_queue: int = 1000, batch_size: int = 32,
+                 max_retries: int = 3, retry_delay: float = 2.0, linger: float = 0.05):
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.linger = linger
+        self._queue: "queue.Queue[int]" = queue.Queue(maxsize=max_queue)
+        # post_id -> first enqueue time; dedupes repeated edits of the same post
+        self._pending: Dict[int, float] = {}
+        self._attempts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+        self.rejected = 0
+        self.last_batch_size = 0
+        self.last_batch_seconds = None
+        self.last_batch_at = None
+        self.last_error = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="inference-worker", daemon=True)
+        self._thread.start()
+        print("✓ Inference worker started")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def enqueue(self, post_id: int) -> bool:
+        """
+        Schedule a post for classification. Never blocks the caller: when the
+        queue is full the job is rejected. Edited posts are marked stale on
+        update (mark_prediction_stale) and new posts have no prediction yet,
+        so the admin read paths' catch-up queries classify them on demand.
+        """
+        with self._lock:
+            if post_id in self._pending:
+                return True
+            try:
+                self._queue.put_nowait(post_id)
+            except queue.Full:
+                self.rejected += 1
+                return False
+            self._pending[post_id] = time.time()
+            return True
+
+    def status(self) -> dict:
+        with self._lock:
+            oldest = min(self._pending.values()) if self._pending else None
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "pending": len(self._pending),
+            "lag_seconds": round(time.time() - oldest, 3) if oldest else 0.0,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "rejected": self.rejected,
+            "last_batch_size": self.last_batch_size,
+            "last_batch_seconds": self.last_batch_seconds,
+            "last_batch_at": self.last_batch_at,
+            "last_error": self.last_error,
+        }
+
+    def _next_batch(self) -> List[int]:
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        # Linger briefly so bursts of new posts share one forward pass
+        deadline = time.perf_counter() + self.linger
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if not batch:
+                continue
+            started = time.perf_counter()
+            try:
+                self._process(batch)
+            except Exception as e:
+                print(f"Error in inference worker batch {batch}: {e}")
+                self.last_error = str(e)
+                self._retry(batch)
+            else:
+                with self._lock:
+                    for post_id in batch:
+                        self._pending.pop(post_id, None)
+                        self._attempts.pop(post_id, None)
+                self.processed += len(batch)
+            self.last_batch_size = len(batch)
+            self.last_batch_seconds = round(time.perf_counter() - started, 3)
+            self.last_batch_at = time.time()
+
+    def _process(self, post_ids: List[int]):
+        from core.database import SessionLocal
+        from models.database import Post, PostStatus
+        from api.admin.predictions import ensure_predictions
+
+        db = SessionLocal()
+        try:
+            posts = db.query(Post).filter(
+                Post.PostID.in_(post_ids),
+                Post.Status != PostStatus.DELETED.value
+            ).all()
+            ensure_predictions(db, posts, sentiment=True, topic=True)
+        finally:
+            db.close()
+
+    def _retry(self, post_ids: List[int]):
+        for post_id in post_ids:
+            attempts = self._attempts.get(post_id, 0) + 1
+            if attempts > self.max_retries:
+                with self._lock:
+                    self._pending.pop(post_id, None)
+                    self._attempts.pop(post_id, None)
+                self.failed += 1
+                continue
+            self._attempts[post_id] = attempts
+            self.retried += 1
+            # Back off linearly; the post stays in _pending so lag keeps growing
+            timer = threading.Timer(self.retry_delay * attempts, self._requeue, args=(post_id,))
+            timer.daemon = True
+            timer.start()
+
+    def _requeue(self, post_id: int):
+        try:
+            self._queue.put_nowait(post_id)
+        except queue.Full:
+            with self._lock:
+                self._pending.pop(post_id, None)
+                self._attempts.pop(post_id, None)
+            self.rejected += 1
+
+
+inference_worker = InferenceWorker(
+    max_queue=settings.INFERENCE_QUEUE_SIZE,
+    batch_size=settings.INFERENCE_BATCH_SIZE,
+    max_retries=settings.INFERENCE_MAX_RETRIES,
+)
+
+
+def enqueue_post(post_id: int) -> bool:
+    """Schedule background classification of a created/edited post"""
+    if not settings.INFERENCE_WORKER_ENABLED:
+        return False
+    return inference_worker.enqueue(post_id)
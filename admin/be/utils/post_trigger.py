@@ -2,7 +2,9 @@
 Trigger logic for posts - automatically hide posts with 10+ reports
 """
 from sqlalchemy.orm import Session
+from core.summary_cache import summary_cache
 from models.database import Post, PostStatus, Report
+from utils.sentiment_rollup import sync_post_rollup
 
 
 def check_and_hide_post(db: Session, post_id: int):
@@ -21,7 +23,9 @@ def check_and_hide_post(db: Session, post_id: int):
         # If post has 10 or more reports and is still approved, hide it
         if report_count >= 10 and post.Status == PostStatus.APPROVED.value:
             post.Status = PostStatus.HIDDEN.value
+            sync_post_rollup(db, post)
             db.commit()
+            summary_cache.invalidate(f"post {post_id} auto-hidden")
             print(f"Post {post_id} has been automatically hidden due to {report_count} reports")
     except Exception as e:
         print(f"Error in check_and_hide_post: {str(e)}")
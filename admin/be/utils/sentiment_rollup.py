@@ -0,0 +1,120 @@
+"""
+Incremental sentiment_daily_rollup maintenance
+
+Each PostPrediction remembers which (day, category, sentiment) bucket it is
+counted in. sync_post_rollup() compares that with what the post should
+contribute now (approved + classified) and moves the count, so the trend
+endpoint only has to sum rollup rows.
+"""
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from models.database import Post, PostPrediction, PostStatus, SentimentDailyRollup
+
+SENTIMENTS = ("Positive", "Negative", "Neutral")
+
+
+def _desired_bucket(post: Post, prediction: PostPrediction):
+    if post.Status != PostStatus.APPROVED.value or not post.CreatedOn:
+        return None
+    if not prediction.SentimentModelVersion or prediction.SentimentLabel not in SENTIMENTS:
+        return None
+    return post.CreatedOn.date(), post.Category or "", prediction.SentimentLabel
+
+
+def _add(db: Session, day, category: str, sentiment: str, delta: int):
+    table = SentimentDailyRollup.__table__
+    counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
+    counts[sentiment] = max(delta, 0)
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        # Single atomic upsert: concurrent writers can't lose counts or race on insert
+        insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+        statement = insert(table).values(Day=day, Category=category, **counts).on_conflict_do_update(
+            index_elements=["Day", "Category"],
+            set_={sentiment: table.c[sentiment] + delta}
+        )
+        db.execute(statement)
+        return
+
+    updated = db.query(SentimentDailyRollup).filter(
+        SentimentDailyRollup.Day == day,
+        SentimentDailyRollup.Category == category
+    ).update({sentiment: table.c[sentiment] + delta}, synchronize_session=False)
+    if not updated:
+        db.add(SentimentDailyRollup(Day=day, Category=category, **counts))
+        db.flush()
+
+
+def _claim_bucket(db: Session, prediction: PostPrediction, desired) -> bool:
+    """
+    Conditionally move the stored bucket to desired: the UPDATE only matches
+    while the row still holds the bucket this session read, so when two
+    sessions move the same post concurrently exactly one of them wins
+    """
+    table = PostPrediction.__table__
+    conditions = [table.c.PostID == prediction.PostID]
+    for column in ("RollupDay", "RollupCategory", "RollupSentiment"):
+        value = getattr(prediction, column)
+        conditions.append(table.c[column].is_(None) if value is None else table.c[column] == value)
+    day, category, sentiment = desired or (None, None, None)
+    with db.no_autoflush:
+        result = db.execute(
+            table.update().where(*conditions)
+            .values(RollupDay=day, RollupCategory=category, RollupSentiment=sentiment)
+        )
+    return result.rowcount == 1
+
+
+def sync_post_rollup(db: Session, post: Post, prediction: PostPrediction = None) -> bool:
+    """
+    Move the post's rollup contribution to match its current status, category
+    and stored sentiment. Does not commit. Returns True if the rollup changed.
+    """
+    if prediction is None:
+        prediction = db.query(PostPrediction).filter(PostPrediction.PostID == post.PostID).first()
+        if prediction is None:
+            # Never classified, so never counted
+            return False
+
+    for _ in range(3):
+        current = None
+        if prediction.RollupDay is not None:
+            current = (prediction.RollupDay, prediction.RollupCategory or "", prediction.RollupSentiment)
+        desired = _desired_bucket(post, prediction)
+        if current == desired:
+            return False
+        # A row not yet in the database (new prediction) can't be counted by anyone else;
+        # a duplicate insert fails on commit and rolls its rollup delta back with it
+        if not inspect(prediction).persistent or _claim_bucket(db, prediction, desired):
+            break
+        # Another session moved this post since it was loaded: re-read its bucket and retry
+        db.refresh(prediction, attribute_names=["RollupDay", "RollupCategory", "RollupSentiment"])
+    else:
+        print(f"⚠ Rollup for post {post.PostID} kept moving concurrently, skipped")
+        return False
+
+    if current:
+        _add(db, *current, -1)
+    if desired:
+        _add(db, *desired, 1)
+    prediction.RollupDay, prediction.RollupCategory, prediction.RollupSentiment = desired or (None, None, None)
+    return True
+
+
+def mark_prediction_stale(db: Session, post: Post) -> bool:
+    """
+    Content edited: drop the model versions of the stored prediction and move
+    the post out of the rollup, so every catch-up query (version IS NULL /
+    RollupDay IS NULL) reclassifies it even if the background worker never
+    does. Does not commit. Returns True if the post had a prediction.
+    """
+    prediction = db.query(PostPrediction).filter(PostPrediction.PostID == post.PostID).first()
+    if prediction is None:
+        return False
+    prediction.SentimentModelVersion = None
+    prediction.TopicModelVersion = None
+    sync_post_rollup(db, post, prediction)
+    return True